@@ -186,6 +186,10 @@ if(CMAKE_COMPILER_IS_GNUCXX)
   endif()
 endif()
 
+if(ENABLE_NATIVE_ARCH AND (CMAKE_COMPILER_IS_GNUCXX OR CMAKE_CXX_COMPILER_ID MATCHES "Clang"))
+  add_extra_compiler_option(-march=native)
+endif()
+
 if(MSVC AND X86_64)
   if(ENABLE_AVX AND NOT MSVC_VERSION LESS 1600)
     add_extra_compiler_option("/arch:AVX")
@@ -40,6 +40,7 @@
 
 #if (VISP_CXX_STANDARD >= VISP_CXX_STANDARD_11)
 #include <visp3/core/vpColVector.h>
+#include <visp3/core/vpMatrix.h>
 
 BEGIN_VISP_NAMESPACE
 /*!
@@ -74,6 +75,24 @@ public:
    */
   virtual std::vector<vpColVector> drawSigmaPoints(const vpColVector &mean, const vpMatrix &covariance) = 0;
 
+  /**
+   * \brief Draw the sigma points according to the current mean and the square root of the
+   * covariance of the state of the Unscented Kalman filter. It is used by the square-root formulation
+   * of the UKF, which does not store the covariance itself.
+   *
+   * The default implementation rebuilds the covariance and calls drawSigmaPoints(). Drawers
+   * should override it to use the square root directly.
+   *
+   * \param[in] mean The current mean of the state of the UKF.
+   * \param[in] sqrtCovariance The lower triangular matrix \f$ \textbf{S} \f$ such as
+   * \f$ \textbf{S} \textbf{S}^T \f$ is the current process covariance of the UKF.
+   * @return std::vector<vpColVector> The sigma points.
+   */
+  virtual std::vector<vpColVector> drawSigmaPointsFromSqrt(const vpColVector &mean, const vpMatrix &sqrtCovariance)
+  {
+    return drawSigmaPoints(mean, sqrtCovariance * sqrtCovariance.transpose());
+  }
+
   /**
    * \brief Computed the weights that correspond to the sigma points that have been drawn.
    *
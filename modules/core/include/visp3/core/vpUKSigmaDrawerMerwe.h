@@ -123,6 +123,18 @@ public:
    */
   virtual std::vector<vpColVector> drawSigmaPoints(const vpColVector &mean, const vpMatrix &covariance) VP_OVERRIDE;
 
+  /**
+   * \brief Draw the sigma points according to the current mean and the square root of the
+   * covariance of the state of the Unscented Kalman filter, without computing any Cholesky's decomposition.
+   * The sigma points are built from the rows of the square root, as done by drawSigmaPoints().
+   *
+   * \param[in] mean The current mean of the state of the UKF.
+   * \param[in] sqrtCovariance The lower triangular matrix \f$ \textbf{S} \f$ such as
+   * \f$ \textbf{S} \textbf{S}^T \f$ is the current process covariance of the UKF.
+   * @return std::vector<vpColVector> The sigma points.
+   */
+  virtual std::vector<vpColVector> drawSigmaPointsFromSqrt(const vpColVector &mean, const vpMatrix &sqrtCovariance) VP_OVERRIDE;
+
   /**
    * \brief Computed the weights that correspond to the sigma points that have been drawn.
    *
@@ -159,6 +159,12 @@ public:
    */
   typedef std::function<vpColVector(const std::vector<vpColVector> &, const std::vector<double> &)> vpMeanFunction;
 
+  /**
+   * \brief Mean function for points stacked in a single matrix. The first argument is a matrix whose
+   * i-th row is the i-th point, the second argument is the list of weights and the return is the weighted mean.
+   */
+  typedef std::function<vpColVector(const vpMatrix &, const std::vector<double> &)> vpMeanBatchFunction;
+
   /**
    * \brief Measurement function, which converts the prior points in the measurement space.
    * The argument is a point of a prior point and the return is its projection in the measurement
@@ -173,6 +179,34 @@ public:
    */
   typedef std::function<vpColVector(const vpColVector &, const double &)> vpProcessFunction;
 
+  /**
+   * \brief Process model function, which projects all the sigma points forward in time at once.
+   * The first argument is a matrix whose i-th row is the i-th sigma point, the second is the period
+   * and the return is a matrix of the same size whose i-th row is the i-th point of the prior.
+   */
+  typedef std::function<vpMatrix(const vpMatrix &, const double &)> vpProcessBatchFunction;
+
+  /**
+   * \brief Measurement function, which converts all the prior points in the measurement space at once.
+   * The argument is a matrix whose i-th row is the i-th prior point and the return is a matrix whose
+   * i-th row is the projection of the i-th prior point in the measurement space.
+   */
+  typedef std::function<vpMatrix(const vpMatrix &)> vpMeasurementBatchFunction;
+
+  /**
+   * \brief Process model function, which projects a sigma point forward in time without allocating its result.
+   * The first argument is a sigma point, the second is the period and the third is the vector, already
+   * allocated by the filter, in which the point of the prior must be written.
+   */
+  typedef std::function<void(const vpColVector &, const double &, vpColVector &)> vpProcessInPlaceFunction;
+
+  /**
+   * \brief Measurement function, which converts a prior point in the measurement space without allocating its result.
+   * The first argument is a prior point and the second is the vector, already allocated by the filter, in which its
+   * projection in the measurement space must be written.
+   */
+  typedef std::function<void(const vpColVector &, vpColVector &)> vpMeasurementInPlaceFunction;
+
   /**
    * \brief Function that computes either the equivalent of an addition or the equivalent
    * of a subtraction in the state space or in the measurement space.
@@ -182,6 +216,19 @@ public:
    */
   typedef std::function<vpColVector(const vpColVector &, const vpColVector &)> vpAddSubFunction;
 
+  /**
+   * \brief Representation of the state covariance matrix that is propagated by the filter.
+   */
+  typedef enum vpCovarianceRepresentation
+  {
+    COVARIANCE_FULL = 0, /*!< The covariance matrix \f$ \textbf{P} \f$ itself is propagated.*/
+    COVARIANCE_SQUARE_ROOT = 1, /*!< The lower triangular matrix \f$ \textbf{S} \f$ such as \f$ \textbf{P} = \textbf{S} \textbf{S}^T \f$
+                                     is propagated, as in the square-root UKF proposed by R. van der Merwe and E. A. Wan.*/
+    COVARIANCE_LDL = 2 /*!< The factors of \f$ \textbf{P} = \textbf{L} \textbf{D} \textbf{L}^T \f$, where \f$ \textbf{L} \f$ is unit lower
+                            triangular and \f$ \textbf{D} \f$ is diagonal, are propagated. It is the UD factorization of G. J. Bierman
+                            and C. L. Thornton, written in its lower triangular form.*/
+  } vpCovarianceRepresentation;
+
   /**
    * \brief Construct a new vpUnscentedKalman object.
    *
@@ -205,6 +252,34 @@ public:
    */
   void init(const vpColVector &mu0, const vpMatrix &P0);
 
+  /**
+   * \brief Choose the representation of the state covariance matrix that is propagated by the filter.
+   *
+   * - With vpUnscentedKalman::COVARIANCE_SQUARE_ROOT, the filter propagates the lower triangular matrix
+   * \f$ \textbf{S} \f$ such as \f$ \textbf{P} = \textbf{S} \textbf{S}^T \f$. The sigma points are
+   * drawn directly from \f$ \textbf{S} \f$, and the unscented transform updates it using a QR-like triangularization
+   * followed by rank-1 Cholesky's updates, so no Cholesky's decomposition is needed at each step. It also guarantees
+   * that the covariance matrix remains positive semi-definite.
+   * - With vpUnscentedKalman::COVARIANCE_LDL, the filter propagates the factors of \f$ \textbf{P} = \textbf{L} \textbf{D} \textbf{L}^T \f$.
+   * The unscented transform updates them using a weighted modified Gram-Schmidt orthogonalization followed by
+   * Agee-Turner's rank-1 updates, which do not require any square root. The square root needed to draw the sigma points
+   * is simply \f$ \textbf{L} \sqrt{\textbf{D}} \f$, which is the Cholesky's factor of \f$ \textbf{P} \f$.
+   *
+   * \warning This method must be called before vpUnscentedKalman::init().
+   *
+   * \warning Unlike vpUnscentedKalman::COVARIANCE_FULL, the default, both factorized representations require
+   * the initial covariance \f$ \textbf{P}_0 \f$ and the process and measurement covariances \f$ \textbf{Q} \f$
+   * and \f$ \textbf{R} \f$ to be positive definite. When one of them is only positive semi-definite, e.g. when
+   * it has a zero variance, vpUnscentedKalman::COVARIANCE_LDL throws a vpException and the Cholesky's decomposition
+   * used by vpUnscentedKalman::COVARIANCE_SQUARE_ROOT is not reliable.
+   *
+   * \param[in] representation The representation of the covariance matrix to use.
+   */
+  inline void setCovarianceRepresentation(const vpCovarianceRepresentation &representation)
+  {
+    m_covRepresentation = representation;
+  }
+
   /**
    * \brief Set the command function to use when computing the prior.
    *
@@ -236,6 +311,16 @@ public:
     m_measMeanFunc = meanFunc;
   }
 
+  /**
+   * \brief Set the measurement mean function to use when computing a mean in the measurement space,
+   * when it works on all the points stacked in a single matrix. It permits to avoid the conversion of
+   * each point when the function is costly to call with a list of vectors (e.g. from Python, where
+   * the matrix can be viewed as a NumPy array without any copy).
+   *
+   * \param meanBatchFunc The mean function to use.
+   */
+  void setMeasurementMeanBatchFunction(const vpMeanBatchFunction &meanBatchFunc);
+
   /**
    * \brief Set the measurement residual function to use when computing a subtraction
    * in the measurement space.
@@ -247,6 +332,67 @@ public:
     m_measResFunc = measResFunc;
   }
 
+  /**
+   * \brief Set the measurement mean and residual functions to vpUnscentedKalman::angleMean and
+   * vpUnscentedKalman::angleResidual, for measurements some components of which are angles
+   * (e.g. range and bearing measurements). As these functions are implemented in C++, it avoids
+   * calling user-defined functions for each filtering step, which is costly e.g. from Python.
+   *
+   * \param[in] angleIndices The indices of the components of the measurements that are angles, in radians.
+   */
+  void setMeasurementAngleIndices(const std::vector<unsigned int> &angleIndices);
+
+  /**
+   * \brief Set a process function that projects all the sigma points forward in time in a single call.
+   * When set, it is used instead of the process function given to the constructor, which permits to
+   * avoid one call per sigma point when the process function is costly to call (e.g. from Python).
+   *
+   * \param fBatch The batch process function to use. Set it to nullptr to go back to the
+   * per-point process function.
+   */
+  inline void setProcessBatchFunction(const vpProcessBatchFunction &fBatch)
+  {
+    m_fBatch = fBatch;
+  }
+
+  /**
+   * \brief Set a measurement function that converts all the prior points in the measurement space
+   * in a single call. When set, it is used instead of the measurement function given to the constructor.
+   *
+   * \param hBatch The batch measurement function to use. Set it to nullptr to go back to the
+   * per-point measurement function.
+   */
+  inline void setMeasurementBatchFunction(const vpMeasurementBatchFunction &hBatch)
+  {
+    m_hBatch = hBatch;
+  }
+
+  /**
+   * \brief Set a process function that writes the projection of a sigma point in a vector that is allocated
+   * once by the filter and reused at each step. When set, it is used instead of the process function given
+   * to the constructor. The batch process function, if set, takes precedence over it.
+   *
+   * \param fInPlace The in-place process function to use. Set it to nullptr to go back to the
+   * process function given to the constructor.
+   */
+  inline void setProcessInPlaceFunction(const vpProcessInPlaceFunction &fInPlace)
+  {
+    m_fInPlace = fInPlace;
+  }
+
+  /**
+   * \brief Set a measurement function that writes the projection of a prior point in a vector that is allocated
+   * once by the filter and reused at each step. When set, it is used instead of the measurement function given
+   * to the constructor. The batch measurement function, if set, takes precedence over it.
+   *
+   * \param hInPlace The in-place measurement function to use. Set it to nullptr to go back to the
+   * measurement function given to the constructor.
+   */
+  inline void setMeasurementInPlaceFunction(const vpMeasurementInPlaceFunction &hInPlace)
+  {
+    m_hInPlace = hInPlace;
+  }
+
   /**
    * \brief Set the state addition function to use when computing a addition
    * in the state space.
@@ -288,6 +434,12 @@ public:
   inline void setProcessCovariance(const vpMatrix &Q)
   {
     m_Q = Q;
+    if (m_covRepresentation == COVARIANCE_SQUARE_ROOT) {
+      m_sqrtQ = m_Q.cholesky();
+    }
+    else if (m_covRepresentation == COVARIANCE_LDL) {
+      ldl(m_Q, m_Lq, m_Dq);
+    }
   }
 
   /**
@@ -298,6 +450,12 @@ public:
   inline void setMeasurementCovariance(const vpMatrix &R)
   {
     m_R = R;
+    if (m_covRepresentation == COVARIANCE_SQUARE_ROOT) {
+      m_sqrtR = m_R.cholesky();
+    }
+    else if (m_covRepresentation == COVARIANCE_LDL) {
+      ldl(m_R, m_Lr, m_Dr);
+    }
   }
 
   /**
@@ -315,6 +473,10 @@ public:
   /**
    * \brief Predict the new state based on the last state and how far in time we want to predict.
    *
+   * It can be called several times in a row, e.g. when the measurements arrive at a lower rate than
+   * the prediction steps: each call then starts from the prior computed by the previous one, and
+   * vpUnscentedKalman::update is called only when a new measurement is available.
+   *
    * \param[in] dt The time in the future we must predict.
    * \param[in] u The command(s) given to the system, if the impact of the system is known.
    *
@@ -327,6 +489,9 @@ public:
    * \brief Update the estimate of the state based on a new measurement.
    *
    * \param[in] z The measurements at the current timestep.
+   *
+   * \warning It uses the sigma points projected by the last call to vpUnscentedKalman::predict,
+   * which must thus have been called beforehand.
    */
   void update(const vpColVector &z);
 
@@ -337,6 +502,14 @@ public:
    */
   inline vpMatrix getPest() const
   {
+    if (m_covRepresentation == COVARIANCE_SQUARE_ROOT) {
+      return m_Sest * m_Sest.transpose();
+    }
+    else if (m_covRepresentation == COVARIANCE_LDL) {
+      vpMatrix D;
+      D.diag(m_Dest);
+      return m_Lest * D * m_Lest.transpose();
+    }
     return m_Pest;
   }
 
@@ -347,6 +520,14 @@ public:
    */
   inline vpMatrix getPpred() const
   {
+    if (m_covRepresentation == COVARIANCE_SQUARE_ROOT) {
+      return m_Spred * m_Spred.transpose();
+    }
+    else if (m_covRepresentation == COVARIANCE_LDL) {
+      vpMatrix D;
+      D.diag(m_Dpred);
+      return m_Lpred * D * m_Lpred.transpose();
+    }
     return m_Ppred;
   }
 
@@ -415,14 +596,52 @@ public:
     }
     return mean;
   }
+
+  /**
+   * \brief Compute the weighted mean of vectors, some components of which are angles. For these components, the mean
+   * is computed as \f$ atan2(\sum_{i} wm_i \sin(\theta_i), \sum_{i} wm_i \cos(\theta_i)) \f$ to handle the wrapping
+   * around \f$ \pi \f$, while the other components are averaged as in vpUnscentedKalman::simpleMean.
+   *
+   * \param[in] vals Vector containing all the vectors we must compute the mean.
+   * \param[in] wm The correspond list of weights.
+   * \param[in] angleIndices The indices of the components that are angles, in radians.
+   * \return vpColVector The weighted mean.
+   */
+  static vpColVector angleMean(const std::vector<vpColVector> &vals, const std::vector<double> &wm,
+                               const std::vector<unsigned int> &angleIndices);
+
+  /**
+   * \brief Compute the residual of vectors, some components of which are angles. For these components,
+   * the difference is brought back in the interval \f$ [-\pi ; \pi] \f$.
+   *
+   * \param[in] a Vector to which we must subtract something.
+   * \param[in] toSubtract The something we must subtract to \b a .
+   * \param[in] angleIndices The indices of the components that are angles, in radians.
+   * \return vpColVector \f$ \textbf{res} = \textbf{a} - \textbf{toSubtract} \f$, with the angles in \f$ [-\pi ; \pi] \f$.
+   */
+  static vpColVector angleResidual(const vpColVector &a, const vpColVector &toSubtract,
+                                   const std::vector<unsigned int> &angleIndices);
 private:
   bool m_hasUpdateBeenCalled; /*!< Set to true when update is called, reset at the beginning of predict.*/
+  vpCovarianceRepresentation m_covRepresentation; /*!< The representation of the covariance matrix that is propagated.*/
+  vpMatrix m_Sest; /*!< Square-root formulation: the lower triangular square root of the estimated covariance matrix.*/
+  vpMatrix m_Spred; /*!< Square-root formulation: the lower triangular square root of the covariance matrix of the prior.*/
+  vpMatrix m_sqrtQ; /*!< Square-root formulation: the lower triangular square root of the process covariance matrix.*/
+  vpMatrix m_sqrtR; /*!< Square-root formulation: the lower triangular square root of the measurement covariance matrix.*/
+  vpMatrix m_Lest; /*!< LDL formulation: the unit lower triangular factor of the estimated covariance matrix.*/
+  vpColVector m_Dest; /*!< LDL formulation: the diagonal factor of the estimated covariance matrix.*/
+  vpMatrix m_Lpred; /*!< LDL formulation: the unit lower triangular factor of the covariance matrix of the prior.*/
+  vpColVector m_Dpred; /*!< LDL formulation: the diagonal factor of the covariance matrix of the prior.*/
+  vpMatrix m_Lq; /*!< LDL formulation: the unit lower triangular factor of the process covariance matrix.*/
+  vpColVector m_Dq; /*!< LDL formulation: the diagonal factor of the process covariance matrix.*/
+  vpMatrix m_Lr; /*!< LDL formulation: the unit lower triangular factor of the measurement covariance matrix.*/
+  vpColVector m_Dr; /*!< LDL formulation: the diagonal factor of the measurement covariance matrix.*/
   vpColVector m_Xest; /*!< The estimated (i.e. filtered) state variables.*/
   vpMatrix m_Pest; /*!< The estimated (i.e. filtered) covariance matrix.*/
   vpMatrix m_Q; /*!< The covariance introduced by performing the prediction step.*/
   std::vector<vpColVector> m_chi; /*!< The sigma points.*/
-  std::vector<double> m_wm; /*!< The weights for the mean computation.*/
-  std::vector<double> m_wc; /*!< The weights for the covariance computation.*/
+  std::vector<double> m_wm; /*!< The weights for the mean computation, computed once in init.*/
+  std::vector<double> m_wc; /*!< The weights for the covariance computation, computed once in init.*/
   std::vector<vpColVector> m_Y; /*!< The projection forward in time of the sigma points according to the process model, called the prior.*/
   vpColVector m_mu; /*!< The mean of the prior.*/
   vpMatrix m_Ppred; /*!< The covariance matrix of the prior.*/
@@ -431,10 +650,17 @@ private:
   vpColVector m_muz; /*!< The mean of the measurement sigma points.*/
   vpMatrix m_Pz; /*!< The covariance matrix of the measurement sigma points.*/
   vpMatrix m_Pxz; /*!< The cross variance of the state and the measurements.*/
+  vpMatrix m_Ex; /*!< Buffer for the residuals of the prior sigma points, allocated in init.*/
+  vpMatrix m_ExT; /*!< Buffer for the transpose of m_Ex, allocated in init.*/
+  vpMatrix m_Ez; /*!< Buffer for the weighted residuals of the measurement sigma points, allocated in init.*/
   vpColVector m_y; /*!< The residual.*/
   vpMatrix m_K; /*!< The Kalman gain.*/
   vpProcessFunction m_f; /*!< Process model function, which projects the sigma points forward in time.*/
   vpMeasurementFunction m_h; /*!< Measurement function, which converts the sigma points in the measurement space.*/
+  vpProcessBatchFunction m_fBatch; /*!< Process model function, which projects all the sigma points forward in time at once.*/
+  vpMeasurementBatchFunction m_hBatch; /*!< Measurement function, which converts all the sigma points in the measurement space at once.*/
+  vpProcessInPlaceFunction m_fInPlace; /*!< Process model function, which writes the projection of a sigma point in a preallocated vector.*/
+  vpMeasurementInPlaceFunction m_hInPlace; /*!< Measurement function, which writes the projection of a prior point in a preallocated vector.*/
   std::shared_ptr<vpUKSigmaDrawerAbstract> m_sigmaDrawer; /*!< Object that permits to draw the sigma points.*/
   vpCommandOnlyFunction m_b; /*!< Function that permits to compute the effect of the commands on the prior, without knowledge of the state.*/
   vpCommandStateFunction m_bx; /*!< Function that permits to compute the effect of the commands on the prior, with knowledge of the state.*/
@@ -465,6 +691,180 @@ private:
    */
   static vpUnscentedTransformResult unscentedTransform(const std::vector<vpColVector> &sigmaPoints, const std::vector<double> &wm,
     const std::vector<double> &wc, const vpMatrix &cov, const vpAddSubFunction &resFunc, const vpMeanFunction &meanFunc);
+
+  /**
+   * \brief Stack a list of vectors in a matrix, such as the i-th row of the matrix is the i-th vector.
+   *
+   * \param[in] points The vectors to stack, which must all have the same size.
+   * \param[out] M The resulting matrix.
+   */
+  static void stackPoints(const std::vector<vpColVector> &points, vpMatrix &M);
+
+  /**
+   * \brief Split a matrix in a list of vectors, such as the i-th vector is the i-th row of the matrix.
+   *
+   * \param[in] M The matrix to split.
+   * \param[out] points The resulting vectors.
+   */
+  static void unstackPoints(const vpMatrix &M, std::vector<vpColVector> &points);
+
+  /**
+   * \brief Compute the cross covariance of the prior and of its projection in the measurement space,
+   * as a single matrix product, and store it in m_Pxz.
+   */
+  void computeCrossCovariance();
+
+  /**
+   * \brief Stack the residuals of a list of vectors with regard to their mean in a matrix, such as the i-th row of
+   * the matrix is the residual of the i-th vector.
+   *
+   * \param[in] points The vectors whose residuals must be stacked.
+   * \param[in] mean The mean of the vectors.
+   * \param[in] resFunc The residual function to use.
+   * \param[out] E The resulting matrix.
+   */
+  static void stackResiduals(const std::vector<vpColVector> &points, const vpColVector &mean,
+                             const vpAddSubFunction &resFunc, vpMatrix &E);
+
+  /**
+   * \brief Solve \f$ \textbf{X} \textbf{L} \textbf{L}^T = \textbf{B} \f$ using forward and backward substitutions
+   * on the rows of \f$ \textbf{X} \f$, e.g. to compute a Kalman gain without inverting the innovation covariance.
+   *
+   * \param[in] B The right-hand side.
+   * \param[in] L The lower triangular Cholesky's factor.
+   * \param[out] X The solution.
+   */
+  static void solveWithCholesky(const vpMatrix &B, const vpMatrix &L, vpMatrix &X);
+
+  /**
+   * \brief Invert a covariance matrix. The inverse of 2x2 and 3x3 matrices, which are common measurement
+   * sizes, is computed in closed form, while the Cholesky's decomposition is used for the other sizes.
+   * The Cholesky's decomposition is also used when the determinant is too small with respect to the product
+   * of the variances for the closed form to be accurate.
+   *
+   * \param[in] P The symmetric positive definite matrix to invert.
+   * \return vpMatrix The inverse of \b P .
+   */
+  static vpMatrix invertCovariance(const vpMatrix &P);
+
+  /**
+   * \brief Multiply each row of a matrix by the corresponding weight.
+   *
+   * \param[inout] M The matrix to scale.
+   * \param[in] w The weights, one per row of \b M .
+   */
+  static void scaleRows(vpMatrix &M, const std::vector<double> &w);
+
+  /**
+   * \brief Update step of the square-root formulation of the UKF.
+   *
+   * \param[in] z The measurements at the current timestep.
+   */
+  void updateSqrt(const vpColVector &z);
+
+  /**
+   * \brief Compute the square-root version of the unscented transform of the sigma points.
+   *
+   * \param[in] sigmaPoints The sigma points we consider.
+   * \param[in] wm The weights to apply for the mean computation.
+   * \param[in] wc The weights to apply for the covariance computation.
+   * \param[in] sqrtCov The lower triangular square root of the constant covariance matrix to add.
+   * \return vpUnscentedTransformResult The mean and the lower triangular square root of the covariance of the sigma points.
+   */
+  static vpUnscentedTransformResult unscentedTransformSqrt(const std::vector<vpColVector> &sigmaPoints, const std::vector<double> &wm,
+    const std::vector<double> &wc, const vpMatrix &sqrtCov, const vpAddSubFunction &resFunc, const vpMeanFunction &meanFunc);
+
+  /**
+   * \brief Compute the lower triangular matrix \f$ \textbf{L} \f$ such as \f$ \textbf{L} \textbf{L}^T = \textbf{A} \textbf{A}^T \f$
+   * using Householder's reflections, i.e. the transpose of the R factor of the QR decomposition of \f$ \textbf{A}^T \f$.
+   *
+   * \param[in] A A matrix with at least as many columns as rows.
+   * \return vpMatrix The lower triangular matrix \f$ \textbf{L} \f$, with a non-negative diagonal.
+   */
+  static vpMatrix triangularize(const vpMatrix &A);
+
+  /**
+   * \brief Rank-1 update of a Cholesky's factor: replace \f$ \textbf{L} \f$ by the lower triangular
+   * matrix \f$ \textbf{L}' \f$ such as \f$ \textbf{L}' \textbf{L}'^T = \textbf{L} \textbf{L}^T + w \textbf{x} \textbf{x}^T \f$.
+   *
+   * \param[inout] L The lower triangular matrix to update.
+   * \param[in] x The vector of the update.
+   * \param[in] w The weight of the update. A negative weight means a downdate.
+   */
+  static void cholUpdate(vpMatrix &L, const vpColVector &x, const double &w);
+
+  /**
+   * \brief Structure that stores the results of the unscented transform, when the covariance
+   * is represented by its LDL factorization.
+   */
+  typedef struct vpUnscentedTransformLDLResult
+  {
+    vpColVector m_mu; /*!< The mean.*/
+    vpMatrix m_L; /*!< The unit lower triangular factor of the covariance matrix.*/
+    vpColVector m_D; /*!< The diagonal factor of the covariance matrix.*/
+  } vpUnscentedTransformLDLResult;
+
+  /**
+   * \brief Update step of the LDL formulation of the UKF.
+   *
+   * \param[in] z The measurements at the current timestep.
+   */
+  void updateLDL(const vpColVector &z);
+
+  /**
+   * \brief Compute the LDL version of the unscented transform of the sigma points.
+   *
+   * \param[in] sigmaPoints The sigma points we consider.
+   * \param[in] wm The weights to apply for the mean computation.
+   * \param[in] wc The weights to apply for the covariance computation.
+   * \param[in] Lcov The unit lower triangular factor of the constant covariance matrix to add.
+   * \param[in] Dcov The diagonal factor of the constant covariance matrix to add.
+   * \return vpUnscentedTransformLDLResult The mean and the LDL factors of the covariance of the sigma points.
+   */
+  static vpUnscentedTransformLDLResult unscentedTransformLDL(const std::vector<vpColVector> &sigmaPoints, const std::vector<double> &wm,
+    const std::vector<double> &wc, const vpMatrix &Lcov, const vpColVector &Dcov, const vpAddSubFunction &resFunc, const vpMeanFunction &meanFunc);
+
+  /**
+   * \brief Compute the factorization \f$ \textbf{P} = \textbf{L} \textbf{D} \textbf{L}^T \f$ of a symmetric positive
+   * definite matrix, where \f$ \textbf{L} \f$ is unit lower triangular and \f$ \textbf{D} \f$ is diagonal.
+   *
+   * \param[in] P The matrix to factorize.
+   * \param[out] L The unit lower triangular factor.
+   * \param[out] D The diagonal of the diagonal factor.
+   */
+  static void ldl(const vpMatrix &P, vpMatrix &L, vpColVector &D);
+
+  /**
+   * \brief Weighted modified Gram-Schmidt orthogonalization: compute the LDL factors such as
+   * \f$ \textbf{L} \textbf{D} \textbf{L}^T = \textbf{W} diag(\textbf{d}_w) \textbf{W}^T \f$.
+   *
+   * \param[in] W A matrix with at least as many columns as rows.
+   * \param[in] Dw The non-negative weights of the columns of \b W .
+   * \param[out] L The unit lower triangular factor.
+   * \param[out] D The diagonal of the diagonal factor.
+   */
+  static void mwgs(const vpMatrix &W, const vpColVector &Dw, vpMatrix &L, vpColVector &D);
+
+  /**
+   * \brief Agee-Turner's rank-1 update of LDL factors: replace \f$ \textbf{L} \f$ and \f$ \textbf{D} \f$ by the factors
+   * of \f$ \textbf{L} \textbf{D} \textbf{L}^T + c \textbf{a} \textbf{a}^T \f$.
+   *
+   * \param[inout] L The unit lower triangular factor to update.
+   * \param[inout] D The diagonal of the diagonal factor to update.
+   * \param[in] a The vector of the update.
+   * \param[in] c The weight of the update. A negative weight means a downdate.
+   */
+  static void ldlUpdate(vpMatrix &L, vpColVector &D, const vpColVector &a, const double &c);
+
+  /**
+   * \brief Compute the square root \f$ \textbf{S} = \textbf{L} \sqrt{\textbf{D}} \f$ of LDL factors, which is
+   * the lower triangular Cholesky's factor of \f$ \textbf{L} \textbf{D} \textbf{L}^T \f$.
+   *
+   * \param[in] L The unit lower triangular factor.
+   * \param[in] D The diagonal of the diagonal factor.
+   * \return vpMatrix The lower triangular square root.
+   */
+  static vpMatrix ldlToSqrt(const vpMatrix &L, const vpColVector &D);
 };
 END_VISP_NAMESPACE
 #endif
@@ -36,6 +36,8 @@
   \brief Sigma points drawer following the E. A. Wan and R. van der Merwe's method.
 */
 
+#include <cmath>
+
 #include <visp3/core/vpUKSigmaDrawerMerwe.h>
 
 #if (VISP_CXX_STANDARD >= VISP_CXX_STANDARD_11)
@@ -66,6 +68,20 @@ std::vector<vpColVector> vpUKSigmaDrawerMerwe::drawSigmaPoints(const vpColVector
   return sigmaPoints;
 }
 
+std::vector<vpColVector> vpUKSigmaDrawerMerwe::drawSigmaPointsFromSqrt(const vpColVector &mean, const vpMatrix &sqrtCovariance)
+{
+  const unsigned int nbSigmaPoints = 2 * m_n + 1;
+  std::vector<vpColVector> sigmaPoints(nbSigmaPoints);
+  sigmaPoints[0] = mean;
+  vpMatrix scaledSqrtCov = std::sqrt(static_cast<double>(m_n) + m_lambda) * sqrtCovariance;
+  for (unsigned int i = 0; i < m_n; ++i) {
+    vpColVector column = scaledSqrtCov.getRow(i).transpose();
+    sigmaPoints[i + 1] = m_addFunc(mean, column);
+    sigmaPoints[i + m_n + 1] = m_resFunc(mean, column);
+  }
+  return sigmaPoints;
+}
+
 vpUKSigmaDrawerMerwe::vpSigmaPointsWeights vpUKSigmaDrawerMerwe::computeWeights()
 {
   const unsigned int nbSigmaPoints = 2 * m_n + 1;
@@ -36,16 +36,24 @@
   \brief Unscented Kalman filtering implementation.
 */
 
+#include <cmath>
+#include <limits>
+
 #include <visp3/core/vpUnscentedKalman.h>
 
 #if (VISP_CXX_STANDARD >= VISP_CXX_STANDARD_11)
 BEGIN_VISP_NAMESPACE
 vpUnscentedKalman::vpUnscentedKalman(const vpMatrix &Q, const vpMatrix &R, std::shared_ptr<vpUKSigmaDrawerAbstract> &drawer, const vpProcessFunction &f, const vpMeasurementFunction &h)
   : m_hasUpdateBeenCalled(false)
+  , m_covRepresentation(COVARIANCE_FULL)
   , m_Q(Q)
   , m_R(R)
   , m_f(f)
   , m_h(h)
+  , m_fBatch(nullptr)
+  , m_hBatch(nullptr)
+  , m_fInPlace(nullptr)
+  , m_hInPlace(nullptr)
   , m_sigmaDrawer(drawer)
   , m_b(nullptr)
   , m_bx(nullptr)
@@ -68,6 +76,55 @@ void vpUnscentedKalman::init(const vpColVector &mu0, const vpMatrix &P0)
   m_Pest = P0;
   m_mu = mu0;
   m_Ppred = P0;
+
+  // The weights attached to the sigma points only depend on the parameters of the drawer,
+  // they are thus computed once for all
+  vpUKSigmaDrawerAbstract::vpSigmaPointsWeights weights = m_sigmaDrawer->computeWeights();
+  m_wm = weights.m_wm;
+  m_wc = weights.m_wc;
+
+  // The shapes of the matrices used in the update step are known from now on: the working buffers
+  // are allocated once for all rather than at each step
+  unsigned int nbPoints = static_cast<unsigned int>(m_wc.size());
+  unsigned int stateSize = mu0.getRows();
+  unsigned int measSize = m_R.getRows();
+  m_Ex.resize(nbPoints, stateSize, false, false);
+  m_ExT.resize(stateSize, nbPoints, false, false);
+  m_Ez.resize(nbPoints, measSize, false, false);
+  m_Pxz.resize(stateSize, measSize, false, false);
+
+  if (m_covRepresentation == COVARIANCE_SQUARE_ROOT) {
+    m_Sest = P0.cholesky();
+    m_Spred = m_Sest;
+    m_sqrtQ = m_Q.cholesky();
+    m_sqrtR = m_R.cholesky();
+  }
+  else if (m_covRepresentation == COVARIANCE_LDL) {
+    ldl(P0, m_Lest, m_Dest);
+    m_Lpred = m_Lest;
+    m_Dpred = m_Dest;
+    ldl(m_Q, m_Lq, m_Dq);
+    ldl(m_R, m_Lr, m_Dr);
+  }
+}
+
+void vpUnscentedKalman::setMeasurementMeanBatchFunction(const vpMeanBatchFunction &meanBatchFunc)
+{
+  m_measMeanFunc = [meanBatchFunc](const std::vector<vpColVector> &vals, const std::vector<double> &wm) {
+    vpMatrix stackedVals;
+    stackPoints(vals, stackedVals);
+    return meanBatchFunc(stackedVals, wm);
+    };
+}
+
+void vpUnscentedKalman::setMeasurementAngleIndices(const std::vector<unsigned int> &angleIndices)
+{
+  m_measMeanFunc = [angleIndices](const std::vector<vpColVector> &vals, const std::vector<double> &wm) {
+    return vpUnscentedKalman::angleMean(vals, wm, angleIndices);
+    };
+  m_measResFunc = [angleIndices](const vpColVector &a, const vpColVector &toSubtract) {
+    return vpUnscentedKalman::angleResidual(a, toSubtract, angleIndices);
+    };
 }
 
 void vpUnscentedKalman::filter(const vpColVector &z, const double &dt, const vpColVector &u)
@@ -84,43 +141,91 @@ void vpUnscentedKalman::predict(const double &dt, const vpColVector &u)
   if (m_hasUpdateBeenCalled) {
     // Update is the last function that has been called, starting from the filtered values.
     x = m_Xest;
-    P = m_Pest;
+    if (m_covRepresentation == COVARIANCE_SQUARE_ROOT) {
+      P = m_Sest;
+    }
+    else if (m_covRepresentation == COVARIANCE_LDL) {
+      P = ldlToSqrt(m_Lest, m_Dest);
+    }
+    else {
+      P = m_Pest;
+    }
     m_hasUpdateBeenCalled = false;
   }
   else {
     // Predict is the last function that has been called, starting from the predicted values.
     x = m_mu;
-    P = m_Ppred;
+    if (m_covRepresentation == COVARIANCE_SQUARE_ROOT) {
+      P = m_Spred;
+    }
+    else if (m_covRepresentation == COVARIANCE_LDL) {
+      P = ldlToSqrt(m_Lpred, m_Dpred);
+    }
+    else {
+      P = m_Ppred;
+    }
   }
 
   // Drawing the sigma points
-  m_chi = m_sigmaDrawer->drawSigmaPoints(x, P);
-
-  // Computation of the attached weights
-  vpUKSigmaDrawerAbstract::vpSigmaPointsWeights weights = m_sigmaDrawer->computeWeights();
-  m_wm = weights.m_wm;
-  m_wc = weights.m_wc;
+  if (m_covRepresentation != COVARIANCE_FULL) {
+    m_chi = m_sigmaDrawer->drawSigmaPointsFromSqrt(x, P);
+  }
+  else {
+    m_chi = m_sigmaDrawer->drawSigmaPoints(x, P);
+  }
 
   // Computation of the prior based on the sigma points
   size_t nbPoints = m_chi.size();
   if (m_Y.size() != nbPoints) {
     m_Y.resize(nbPoints);
   }
+  if (m_fBatch) {
+    vpMatrix chi;
+    stackPoints(m_chi, chi);
+    vpMatrix Y = m_fBatch(chi, dt);
+    if ((Y.getRows() != chi.getRows()) || (Y.getCols() != chi.getCols())) {
+      throw(vpException(vpException::dimensionError, "The batch process function must return a matrix of the same size as its input"));
+    }
+    unstackPoints(Y, m_Y);
+  }
+  else if (m_fInPlace) {
+    // The points of the prior are reused from one step to another, so resizing them does not reallocate anything
+    for (size_t i = 0; i < nbPoints; ++i) {
+      m_Y[i].resize(m_chi[i].getRows(), false);
+      m_fInPlace(m_chi[i], dt, m_Y[i]);
+    }
+  }
+  else {
+    for (size_t i = 0; i < nbPoints; ++i) {
+      m_Y[i] = m_f(m_chi[i], dt);
+    }
+  }
   for (size_t i = 0; i < nbPoints; ++i) {
-    vpColVector prior = m_f(m_chi[i], dt);
     if (m_b) {
-      prior = m_stateAddFunction(prior, m_b(u, dt));
+      m_Y[i] = m_stateAddFunction(m_Y[i], m_b(u, dt));
     }
     else if (m_bx) {
-      prior = m_stateAddFunction(prior, m_bx(u, m_chi[i], dt));
+      m_Y[i] = m_stateAddFunction(m_Y[i], m_bx(u, m_chi[i], dt));
     }
-    m_Y[i] = prior;
   }
 
   // Computation of the mean and covariance of the prior
-  vpUnscentedTransformResult transformResults = unscentedTransform(m_Y, m_wm, m_wc, m_Q, m_stateResFunc, m_stateMeanFunc);
-  m_mu = transformResults.m_mu;
-  m_Ppred = transformResults.m_P;
+  if (m_covRepresentation == COVARIANCE_SQUARE_ROOT) {
+    vpUnscentedTransformResult transformResults = unscentedTransformSqrt(m_Y, m_wm, m_wc, m_sqrtQ, m_stateResFunc, m_stateMeanFunc);
+    m_mu = transformResults.m_mu;
+    m_Spred = transformResults.m_P;
+  }
+  else if (m_covRepresentation == COVARIANCE_LDL) {
+    vpUnscentedTransformLDLResult transformResults = unscentedTransformLDL(m_Y, m_wm, m_wc, m_Lq, m_Dq, m_stateResFunc, m_stateMeanFunc);
+    m_mu = transformResults.m_mu;
+    m_Lpred = transformResults.m_L;
+    m_Dpred = transformResults.m_D;
+  }
+  else {
+    vpUnscentedTransformResult transformResults = unscentedTransform(m_Y, m_wm, m_wc, m_Q, m_stateResFunc, m_stateMeanFunc);
+    m_mu = transformResults.m_mu;
+    m_Ppred = transformResults.m_P;
+  }
 }
 
 void vpUnscentedKalman::update(const vpColVector &z)
@@ -129,8 +234,36 @@ void vpUnscentedKalman::update(const vpColVector &z)
   if (m_Z.size() != nbPoints) {
     m_Z.resize(nbPoints);
   }
-  for (size_t i = 0; i < nbPoints; ++i) {
-    m_Z[i] = (m_h(m_Y[i]));
+  if (m_hBatch) {
+    vpMatrix Y;
+    stackPoints(m_Y, Y);
+    vpMatrix Z = m_hBatch(Y);
+    if (Z.getRows() != Y.getRows()) {
+      throw(vpException(vpException::dimensionError, "The batch measurement function must return as many rows as its input"));
+    }
+    unstackPoints(Z, m_Z);
+  }
+  else if (m_hInPlace) {
+    // The measurement sigma points are reused from one step to another, so resizing them does not reallocate anything
+    unsigned int dimZ = m_R.getRows();
+    for (size_t i = 0; i < nbPoints; ++i) {
+      m_Z[i].resize(dimZ, false);
+      m_hInPlace(m_Y[i], m_Z[i]);
+    }
+  }
+  else {
+    for (size_t i = 0; i < nbPoints; ++i) {
+      m_Z[i] = (m_h(m_Y[i]));
+    }
+  }
+
+  if (m_covRepresentation == COVARIANCE_SQUARE_ROOT) {
+    updateSqrt(z);
+    return;
+  }
+  else if (m_covRepresentation == COVARIANCE_LDL) {
+    updateLDL(z);
+    return;
   }
 
   // Computation of the mean and covariance of the prior expressed in the measurement space
@@ -139,12 +272,16 @@ void vpUnscentedKalman::update(const vpColVector &z)
   m_Pz = transformResults.m_P;
 
   // Computation of the Kalman gain
-  vpMatrix Pxz = m_wc[0] * m_stateResFunc(m_Y[0], m_mu) * m_measResFunc(m_Z[0], m_muz).transpose();
-  size_t nbPts = m_wc.size();
-  for (size_t i = 1; i < nbPts; ++i) {
-    Pxz += m_wc[i] * m_stateResFunc(m_Y[i], m_mu) * m_measResFunc(m_Z[i], m_muz).transpose();
+  computeCrossCovariance();
+  const vpMatrix &Pxz = m_Pxz;
+  if (m_Pz.getRows() <= 3) {
+    m_K = Pxz * invertCovariance(m_Pz);
+  }
+  else {
+    // Pz is symmetric positive definite: K = Pxz Pz^{-1} is obtained by solving with its Cholesky's factor
+    // rather than by forming its inverse
+    solveWithCholesky(Pxz, m_Pz.cholesky(), m_K);
   }
-  m_K = Pxz * m_Pz.inverseByCholesky();
 
   // Updating the estimate
   m_Xest = m_stateAddFunction(m_mu, m_K * m_measResFunc(z, m_muz));
@@ -152,6 +289,242 @@ void vpUnscentedKalman::update(const vpColVector &z)
   m_hasUpdateBeenCalled = true;
 }
 
+void vpUnscentedKalman::updateSqrt(const vpColVector &z)
+{
+  // Computation of the mean and square root of the covariance of the prior expressed in the measurement space
+  vpUnscentedTransformResult transformResults = unscentedTransformSqrt(m_Z, m_wm, m_wc, m_sqrtR, m_measResFunc, m_measMeanFunc);
+  m_muz = transformResults.m_mu;
+  const vpMatrix &Sz = transformResults.m_P;
+
+  // Computation of the cross covariance
+  computeCrossCovariance();
+  const vpMatrix &Pxz = m_Pxz;
+
+  // Computation of the Kalman gain K = Pxz (Sz Sz^T)^{-1}, without inverting Pz
+  unsigned int m = Sz.getRows();
+  solveWithCholesky(Pxz, Sz, m_K);
+
+  // Updating the estimate: S S^T = Spred Spred^T - (K Sz) (K Sz)^T
+  m_Xest = m_stateAddFunction(m_mu, m_K * m_measResFunc(z, m_muz));
+  vpMatrix U = m_K * Sz;
+  m_Sest = m_Spred;
+  for (unsigned int j = 0; j < m; ++j) {
+    cholUpdate(m_Sest, U.getCol(j), -1.);
+  }
+  m_hasUpdateBeenCalled = true;
+}
+
+void vpUnscentedKalman::updateLDL(const vpColVector &z)
+{
+  // Computation of the mean and LDL factors of the covariance of the prior expressed in the measurement space
+  vpUnscentedTransformLDLResult transformResults = unscentedTransformLDL(m_Z, m_wm, m_wc, m_Lr, m_Dr, m_measResFunc, m_measMeanFunc);
+  m_muz = transformResults.m_mu;
+  const vpMatrix &Lz = transformResults.m_L;
+  const vpColVector &Dz = transformResults.m_D;
+
+  // Computation of the cross covariance
+  computeCrossCovariance();
+  const vpMatrix &Pxz = m_Pxz;
+
+  // Computation of the Kalman gain K = Pxz (Lz Dz Lz^T)^{-1}, using substitutions on the unit
+  // triangular factor instead of inverting Pz
+  unsigned int nbRows = Pxz.getRows();
+  unsigned int m = Lz.getRows();
+  m_K.resize(nbRows, m, false, false);
+  for (unsigned int r = 0; r < nbRows; ++r) {
+    vpColVector y(m);
+    // Solving Lz y = Pxz[r]^T, then dividing by Dz
+    for (unsigned int i = 0; i < m; ++i) {
+      double sum = Pxz[r][i];
+      for (unsigned int j = 0; j < i; ++j) {
+        sum -= Lz[i][j] * y[j];
+      }
+      y[i] = sum;
+    }
+    for (unsigned int i = 0; i < m; ++i) {
+      y[i] /= Dz[i];
+    }
+    // Solving Lz^T K[r]^T = y
+    for (unsigned int i = m; i-- > 0;) {
+      double sum = y[i];
+      for (unsigned int j = i + 1; j < m; ++j) {
+        sum -= Lz[j][i] * m_K[r][j];
+      }
+      m_K[r][i] = sum;
+    }
+  }
+
+  // Updating the estimate: L D L^T = Lpred Dpred Lpred^T - (K Lz) Dz (K Lz)^T
+  m_Xest = m_stateAddFunction(m_mu, m_K * m_measResFunc(z, m_muz));
+  vpMatrix KLz = m_K * Lz;
+  m_Lest = m_Lpred;
+  m_Dest = m_Dpred;
+  for (unsigned int j = 0; j < m; ++j) {
+    ldlUpdate(m_Lest, m_Dest, KLz.getCol(j), -Dz[j]);
+  }
+  m_hasUpdateBeenCalled = true;
+}
+
+vpColVector vpUnscentedKalman::angleMean(const std::vector<vpColVector> &vals, const std::vector<double> &wm,
+                                          const std::vector<unsigned int> &angleIndices)
+{
+  vpColVector mean = simpleMean(vals, wm);
+  size_t nbPoints = vals.size();
+  for (unsigned int idx : angleIndices) {
+    double sumCos = 0.;
+    double sumSin = 0.;
+    for (size_t i = 0; i < nbPoints; ++i) {
+      sumCos += wm[i] * std::cos(vals[i][idx]);
+      sumSin += wm[i] * std::sin(vals[i][idx]);
+    }
+    mean[idx] = std::atan2(sumSin, sumCos);
+  }
+  return mean;
+}
+
+vpColVector vpUnscentedKalman::angleResidual(const vpColVector &a, const vpColVector &toSubtract,
+                                             const std::vector<unsigned int> &angleIndices)
+{
+  vpColVector res = a - toSubtract;
+  for (unsigned int idx : angleIndices) {
+    // The IEEE remainder is directly in the interval [-Pi; Pi]
+    res[idx] = std::remainder(res[idx], 2. * M_PI);
+  }
+  return res;
+}
+
+void vpUnscentedKalman::computeCrossCovariance()
+{
+  // The buffers have been sized in init, so that nothing is reallocated here
+  stackResiduals(m_Y, m_mu, m_stateResFunc, m_Ex);
+  stackResiduals(m_Z, m_muz, m_measResFunc, m_Ez);
+  scaleRows(m_Ez, m_wc);
+  m_Ex.transpose(m_ExT);
+  vpMatrix::mult2Matrices(m_ExT, m_Ez, m_Pxz);
+}
+
+void vpUnscentedKalman::solveWithCholesky(const vpMatrix &B, const vpMatrix &L, vpMatrix &X)
+{
+  unsigned int nbRows = B.getRows();
+  unsigned int m = L.getRows();
+  X.resize(nbRows, m, false, false);
+  vpColVector y(m);
+  for (unsigned int r = 0; r < nbRows; ++r) {
+    // Solving L y = B[r]^T
+    for (unsigned int i = 0; i < m; ++i) {
+      double sum = B[r][i];
+      for (unsigned int j = 0; j < i; ++j) {
+        sum -= L[i][j] * y[j];
+      }
+      y[i] = sum / L[i][i];
+    }
+    // Solving L^T X[r]^T = y
+    for (unsigned int i = m; i-- > 0;) {
+      double sum = y[i];
+      for (unsigned int j = i + 1; j < m; ++j) {
+        sum -= L[j][i] * X[r][j];
+      }
+      X[r][i] = sum / L[i][i];
+    }
+  }
+}
+
+vpMatrix vpUnscentedKalman::invertCovariance(const vpMatrix &P)
+{
+  unsigned int dim = P.getRows();
+  if (dim == 2) {
+    // Closed-form inverse: 1/det [[d, -b], [-c, a]]
+    double det = (P[0][0] * P[1][1]) - (P[0][1] * P[1][0]);
+    // The threshold is relative to the variances, so that it does not depend on the units of the measurements
+    if (std::fabs(det) <= (std::numeric_limits<double>::epsilon() * std::fabs(P[0][0] * P[1][1]))) {
+      // Ill-conditioned: the closed form would lose too much precision
+      return P.inverseByCholesky();
+    }
+    double invDet = 1. / det;
+    vpMatrix Pinv(2, 2);
+    Pinv[0][0] = P[1][1] * invDet;
+    Pinv[0][1] = -P[0][1] * invDet;
+    Pinv[1][0] = -P[1][0] * invDet;
+    Pinv[1][1] = P[0][0] * invDet;
+    return Pinv;
+  }
+  else if (dim == 3) {
+    // Closed-form inverse using the cofactors
+    double c00 = (P[1][1] * P[2][2]) - (P[1][2] * P[2][1]);
+    double c01 = (P[1][2] * P[2][0]) - (P[1][0] * P[2][2]);
+    double c02 = (P[1][0] * P[2][1]) - (P[1][1] * P[2][0]);
+    double det = (P[0][0] * c00) + (P[0][1] * c01) + (P[0][2] * c02);
+    // The threshold is relative to the variances, so that it does not depend on the units of the measurements
+    if (std::fabs(det) <= (std::numeric_limits<double>::epsilon() * std::fabs(P[0][0] * P[1][1] * P[2][2]))) {
+      // Ill-conditioned: the closed form would lose too much precision
+      return P.inverseByCholesky();
+    }
+    double invDet = 1. / det;
+    vpMatrix Pinv(3, 3);
+    Pinv[0][0] = c00 * invDet;
+    Pinv[1][0] = c01 * invDet;
+    Pinv[2][0] = c02 * invDet;
+    Pinv[0][1] = ((P[0][2] * P[2][1]) - (P[0][1] * P[2][2])) * invDet;
+    Pinv[1][1] = ((P[0][0] * P[2][2]) - (P[0][2] * P[2][0])) * invDet;
+    Pinv[2][1] = ((P[0][1] * P[2][0]) - (P[0][0] * P[2][1])) * invDet;
+    Pinv[0][2] = ((P[0][1] * P[1][2]) - (P[0][2] * P[1][1])) * invDet;
+    Pinv[1][2] = ((P[0][2] * P[1][0]) - (P[0][0] * P[1][2])) * invDet;
+    Pinv[2][2] = ((P[0][0] * P[1][1]) - (P[0][1] * P[1][0])) * invDet;
+    return Pinv;
+  }
+  return P.inverseByCholesky();
+}
+
+void vpUnscentedKalman::stackResiduals(const std::vector<vpColVector> &points, const vpColVector &mean,
+                                       const vpAddSubFunction &resFunc, vpMatrix &E)
+{
+  unsigned int nbPoints = static_cast<unsigned int>(points.size());
+  unsigned int dim = mean.getRows();
+  E.resize(nbPoints, dim, false, false);
+  for (unsigned int i = 0; i < nbPoints; ++i) {
+    vpColVector e = resFunc(points[i], mean);
+    for (unsigned int j = 0; j < dim; ++j) {
+      E[i][j] = e[j];
+    }
+  }
+}
+
+void vpUnscentedKalman::scaleRows(vpMatrix &M, const std::vector<double> &w)
+{
+  unsigned int nbRows = M.getRows();
+  unsigned int nbCols = M.getCols();
+  for (unsigned int i = 0; i < nbRows; ++i) {
+    for (unsigned int j = 0; j < nbCols; ++j) {
+      M[i][j] *= w[i];
+    }
+  }
+}
+
+void vpUnscentedKalman::stackPoints(const std::vector<vpColVector> &points, vpMatrix &M)
+{
+  unsigned int nbPoints = static_cast<unsigned int>(points.size());
+  unsigned int dim = (nbPoints > 0) ? points[0].getRows() : 0;
+  M.resize(nbPoints, dim, false, false);
+  for (unsigned int i = 0; i < nbPoints; ++i) {
+    for (unsigned int j = 0; j < dim; ++j) {
+      M[i][j] = points[i][j];
+    }
+  }
+}
+
+void vpUnscentedKalman::unstackPoints(const vpMatrix &M, std::vector<vpColVector> &points)
+{
+  unsigned int nbPoints = M.getRows();
+  unsigned int dim = M.getCols();
+  points.resize(nbPoints);
+  for (unsigned int i = 0; i < nbPoints; ++i) {
+    points[i].resize(dim, false);
+    for (unsigned int j = 0; j < dim; ++j) {
+      points[i][j] = M[i][j];
+    }
+  }
+}
+
 vpUnscentedKalman::vpUnscentedTransformResult vpUnscentedKalman::unscentedTransform(const std::vector<vpColVector> &sigmaPoints,
     const std::vector<double> &wm, const std::vector<double> &wc, const vpMatrix &cov,
     const vpAddSubFunction &resFunc, const vpMeanFunction &meanFunc
@@ -162,15 +535,276 @@ vpUnscentedKalman::vpUnscentedTransformResult vpUnscentedKalman::unscentedTransf
   // Computation of the mean
   result.m_mu = meanFunc(sigmaPoints, wm);
 
-  // Computation of the covariance
-  result.m_P = cov;
+  // Computation of the covariance as a single matrix product E^T diag(wc) E, where the i-th row of E
+  // is the residual of the i-th sigma point, so that it benefits from Blas/Lapack when available
+  vpMatrix E;
+  stackResiduals(sigmaPoints, result.m_mu, resFunc, E);
+  vpMatrix Ew = E;
+  scaleRows(Ew, wc);
+  result.m_P = cov + (E.transpose() * Ew);
+  return result;
+}
+vpUnscentedKalman::vpUnscentedTransformResult vpUnscentedKalman::unscentedTransformSqrt(const std::vector<vpColVector> &sigmaPoints,
+    const std::vector<double> &wm, const std::vector<double> &wc, const vpMatrix &sqrtCov,
+    const vpAddSubFunction &resFunc, const vpMeanFunction &meanFunc
+)
+{
+  vpUnscentedKalman::vpUnscentedTransformResult result;
+
+  // Computation of the mean
+  result.m_mu = meanFunc(sigmaPoints, wm);
+
+  // Stacking the weighted residuals of the sigma points 1..2n and the square root of the additive covariance
   size_t nbSigmaPoints = sigmaPoints.size();
-  for (size_t i = 0; i < nbSigmaPoints; ++i) {
+  unsigned int dim = sqrtCov.getRows();
+  unsigned int nbCols = static_cast<unsigned int>(nbSigmaPoints - 1) + sqrtCov.getCols();
+  vpMatrix A(dim, nbCols, 0.);
+  for (size_t i = 1; i < nbSigmaPoints; ++i) {
+    if (wc[i] < 0.) {
+      throw(vpException(vpException::badValue, "The square-root UKF only supports negative covariance weight for the first sigma point"));
+    }
+    vpColVector e = std::sqrt(wc[i]) * resFunc(sigmaPoints[i], result.m_mu);
+    unsigned int c = static_cast<unsigned int>(i - 1);
+    for (unsigned int r = 0; r < dim; ++r) {
+      A[r][c] = e[r];
+    }
+  }
+  for (unsigned int c = 0; c < sqrtCov.getCols(); ++c) {
+    for (unsigned int r = 0; r < dim; ++r) {
+      A[r][static_cast<unsigned int>(nbSigmaPoints - 1) + c] = sqrtCov[r][c];
+    }
+  }
+
+  // Triangularization, followed by the rank-1 update (or downdate) for the first sigma point,
+  // whose weight may be negative
+  result.m_P = triangularize(A);
+  cholUpdate(result.m_P, resFunc(sigmaPoints[0], result.m_mu), wc[0]);
+  return result;
+}
+
+vpUnscentedKalman::vpUnscentedTransformLDLResult vpUnscentedKalman::unscentedTransformLDL(const std::vector<vpColVector> &sigmaPoints,
+    const std::vector<double> &wm, const std::vector<double> &wc, const vpMatrix &Lcov, const vpColVector &Dcov,
+    const vpAddSubFunction &resFunc, const vpMeanFunction &meanFunc
+)
+{
+  vpUnscentedKalman::vpUnscentedTransformLDLResult result;
+
+  // Computation of the mean
+  result.m_mu = meanFunc(sigmaPoints, wm);
+
+  // Stacking the residuals of the sigma points 1..2n and the unit triangular factor of the additive covariance,
+  // along with their weights
+  size_t nbSigmaPoints = sigmaPoints.size();
+  unsigned int dim = Lcov.getRows();
+  unsigned int nbCols = static_cast<unsigned int>(nbSigmaPoints - 1) + Lcov.getCols();
+  vpMatrix W(dim, nbCols, 0.);
+  vpColVector Dw(nbCols);
+  for (size_t i = 1; i < nbSigmaPoints; ++i) {
+    if (wc[i] < 0.) {
+      throw(vpException(vpException::badValue, "The LDL UKF only supports negative covariance weight for the first sigma point"));
+    }
     vpColVector e = resFunc(sigmaPoints[i], result.m_mu);
-    result.m_P += wc[i] * e*e.transpose();
+    unsigned int c = static_cast<unsigned int>(i - 1);
+    for (unsigned int r = 0; r < dim; ++r) {
+      W[r][c] = e[r];
+    }
+    Dw[c] = wc[i];
   }
+  for (unsigned int c = 0; c < Lcov.getCols(); ++c) {
+    unsigned int cw = static_cast<unsigned int>(nbSigmaPoints - 1) + c;
+    for (unsigned int r = 0; r < dim; ++r) {
+      W[r][cw] = Lcov[r][c];
+    }
+    Dw[cw] = Dcov[c];
+  }
+
+  // Orthogonalization, followed by the rank-1 update (or downdate) for the first sigma point,
+  // whose weight may be negative
+  mwgs(W, Dw, result.m_L, result.m_D);
+  ldlUpdate(result.m_L, result.m_D, resFunc(sigmaPoints[0], result.m_mu), wc[0]);
   return result;
 }
+
+void vpUnscentedKalman::ldl(const vpMatrix &P, vpMatrix &L, vpColVector &D)
+{
+  unsigned int n = P.getRows();
+  if (P.getCols() != n) {
+    throw(vpException(vpException::dimensionError, "Cannot compute the LDL factorization of a non square matrix"));
+  }
+  L.eye(n);
+  D.resize(n, true);
+  for (unsigned int j = 0; j < n; ++j) {
+    double d = P[j][j];
+    for (unsigned int k = 0; k < j; ++k) {
+      d -= D[k] * L[j][k] * L[j][k];
+    }
+    if (d <= 0.) {
+      throw(vpException(vpException::fatalError, "Cannot compute the LDL factorization of a non positive definite matrix"));
+    }
+    D[j] = d;
+    for (unsigned int i = j + 1; i < n; ++i) {
+      double l = P[i][j];
+      for (unsigned int k = 0; k < j; ++k) {
+        l -= D[k] * L[i][k] * L[j][k];
+      }
+      L[i][j] = l / d;
+    }
+  }
+}
+
+void vpUnscentedKalman::mwgs(const vpMatrix &W, const vpColVector &Dw, vpMatrix &L, vpColVector &D)
+{
+  unsigned int n = W.getRows();
+  unsigned int m = W.getCols();
+  vpMatrix V = W;
+  L.eye(n);
+  D.resize(n, true);
+  // Weighted squared norms of the rows before orthogonalization, the scale of each row
+  vpColVector scales(n, 0.);
+  for (unsigned int k = 0; k < n; ++k) {
+    for (unsigned int j = 0; j < m; ++j) {
+      scales[k] += std::fabs(Dw[j]) * V[k][j] * V[k][j];
+    }
+  }
+  for (unsigned int k = 0; k < n; ++k) {
+    double d = 0.;
+    for (unsigned int j = 0; j < m; ++j) {
+      d += Dw[j] * V[k][j] * V[k][j];
+    }
+    D[k] = d;
+    // What remains of the row is rounding errors when it is negligible with regard to its initial norm,
+    // whatever the units of the state: nothing can be orthogonalized against it
+    if (d <= (std::numeric_limits<double>::epsilon() * scales[k])) {
+      continue;
+    }
+    for (unsigned int i = k + 1; i < n; ++i) {
+      double dot = 0.;
+      for (unsigned int j = 0; j < m; ++j) {
+        dot += Dw[j] * V[i][j] * V[k][j];
+      }
+      double l = dot / d;
+      L[i][k] = l;
+      for (unsigned int j = 0; j < m; ++j) {
+        V[i][j] -= l * V[k][j];
+      }
+    }
+  }
+}
+
+void vpUnscentedKalman::ldlUpdate(vpMatrix &L, vpColVector &D, const vpColVector &a, const double &c)
+{
+  unsigned int n = L.getRows();
+  vpColVector v = a;
+  double cj = c;
+  for (unsigned int j = 0; j < n; ++j) {
+    double s = v[j];
+    double d = D[j] + (cj * s * s);
+    if (d <= 0.) {
+      throw(vpException(vpException::fatalError, "The LDL downdate resulted in a non positive definite matrix"));
+    }
+    double b = cj / d;
+    double beta = s * b;
+    cj = b * D[j];
+    D[j] = d;
+    for (unsigned int i = j + 1; i < n; ++i) {
+      v[i] -= s * L[i][j];
+      L[i][j] += beta * v[i];
+    }
+  }
+}
+
+vpMatrix vpUnscentedKalman::ldlToSqrt(const vpMatrix &L, const vpColVector &D)
+{
+  unsigned int n = L.getRows();
+  vpMatrix S(n, n, 0.);
+  for (unsigned int c = 0; c < n; ++c) {
+    double sqrtD = std::sqrt(D[c]);
+    for (unsigned int r = c; r < n; ++r) {
+      S[r][c] = L[r][c] * sqrtD;
+    }
+  }
+  return S;
+}
+
+vpMatrix vpUnscentedKalman::triangularize(const vpMatrix &A)
+{
+  unsigned int n = A.getRows();
+  unsigned int m = A.getCols();
+  if (m < n) {
+    throw(vpException(vpException::dimensionError, "Cannot triangularize a matrix with less columns than rows"));
+  }
+  vpMatrix W = A;
+  vpColVector v(m);
+  for (unsigned int i = 0; i < n; ++i) {
+    // Householder's reflection that zeroes W[i][i+1..m-1]
+    double normX = 0.;
+    double normRow = 0.;
+    for (unsigned int j = 0; j < m; ++j) {
+      double w2 = W[i][j] * W[i][j];
+      normRow += w2;
+      if (j >= i) {
+        normX += w2;
+      }
+    }
+    normX = std::sqrt(normX);
+    // The reflections preserve the norm of the rows: compare to it rather than to an absolute threshold,
+    // so that small covariances are not taken for zero ones
+    if (normX <= (std::numeric_limits<double>::epsilon() * std::sqrt(normRow))) {
+      continue;
+    }
+    double alpha = (W[i][i] > 0.) ? -normX : normX;
+    double normV = 0.;
+    for (unsigned int j = i; j < m; ++j) {
+      v[j] = W[i][j];
+    }
+    v[i] -= alpha;
+    // As alpha has the opposite sign of W[i][i], normV >= 2 normX^2 > 0
+    for (unsigned int j = i; j < m; ++j) {
+      normV += v[j] * v[j];
+    }
+    for (unsigned int r = i; r < n; ++r) {
+      double dot = 0.;
+      for (unsigned int j = i; j < m; ++j) {
+        dot += W[r][j] * v[j];
+      }
+      double coeff = 2. * dot / normV;
+      for (unsigned int j = i; j < m; ++j) {
+        W[r][j] -= coeff * v[j];
+      }
+    }
+  }
+
+  // Keeping the lower triangular part, with a non-negative diagonal
+  vpMatrix L(n, n, 0.);
+  for (unsigned int c = 0; c < n; ++c) {
+    double sign = (W[c][c] < 0.) ? -1. : 1.;
+    for (unsigned int r = c; r < n; ++r) {
+      L[r][c] = sign * W[r][c];
+    }
+  }
+  return L;
+}
+
+void vpUnscentedKalman::cholUpdate(vpMatrix &L, const vpColVector &x, const double &w)
+{
+  unsigned int n = L.getRows();
+  double sign = (w < 0.) ? -1. : 1.;
+  vpColVector v = std::sqrt(std::abs(w)) * x;
+  for (unsigned int k = 0; k < n; ++k) {
+    double r2 = (L[k][k] * L[k][k]) + (sign * v[k] * v[k]);
+    if (r2 <= 0.) {
+      throw(vpException(vpException::fatalError, "The Cholesky's downdate resulted in a non positive definite matrix"));
+    }
+    double r = std::sqrt(r2);
+    double c = r / L[k][k];
+    double s = v[k] / L[k][k];
+    L[k][k] = r;
+    for (unsigned int i = k + 1; i < n; ++i) {
+      L[i][k] = (L[i][k] + (sign * s * v[i])) / c;
+      v[i] = (c * v[i]) - (s * L[i][k]);
+    }
+  }
+}
 END_VISP_NAMESPACE
 #else
 void vpUnscentedKalman_dummy()
@@ -0,0 +1,451 @@
+/*
+ * ViSP, open source Visual Servoing Platform software.
+ * Copyright (C) 2005 - 2024 by Inria. All rights reserved.
+ *
+ * This software is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 2 of the License, or
+ * (at your option) any later version.
+ * See the file LICENSE.txt at the root directory of this source
+ * distribution for additional information about the GNU GPL.
+ *
+ * For using ViSP with software that can not be combined with the GNU
+ * GPL, please contact Inria about acquiring a ViSP Professional
+ * Edition License.
+ *
+ * See https://visp.inria.fr for more information.
+ *
+ * This software was developed at:
+ * Inria Rennes - Bretagne Atlantique
+ * Campus Universitaire de Beaulieu
+ * 35042 Rennes Cedex
+ * France
+ *
+ * If you have questions regarding the use of this file, please contact
+ * Inria at visp@inria.fr
+ *
+ * This file is provided AS IS with NO WARRANTY OF ANY KIND, INCLUDING THE
+ * WARRANTY OF DESIGN, MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE.
+ *
+ * Description:
+ * Test Unscented Kalman Filter functionalities.
+ */
+
+/*!
+  \example catchUnscentedKalman.cpp
+
+  Test some vpUnscentedKalman functionalities.
+  A radar measuring the range and elevation angle of an aircraft flying at constant velocity
+  is filtered with the different covariance representations and the different kinds of
+  process and measurement functions, which must all lead to the same estimates.
+*/
+#include <visp3/core/vpConfig.h>
+
+#if defined(VISP_HAVE_CATCH2) && (VISP_CXX_STANDARD >= VISP_CXX_STANDARD_11)
+#include <algorithm>
+#include <cmath>
+#include <iostream>
+#include <vector>
+
+#include <visp3/core/vpColVector.h>
+#include <visp3/core/vpGaussRand.h>
+#include <visp3/core/vpMath.h>
+#include <visp3/core/vpMatrix.h>
+#include <visp3/core/vpUKSigmaDrawerMerwe.h>
+#include <visp3/core/vpUnscentedKalman.h>
+
+#include <catch_amalgamated.hpp>
+
+#ifdef ENABLE_VISP_NAMESPACE
+using namespace VISP_NAMESPACE_NAME;
+#endif
+
+namespace
+{
+const double dt = 3.; //!< Period between two measurements, in seconds
+const unsigned int nbSteps = 100; //!< Number of filtering steps of the scenario
+const double tolerance = 1e-6; //!< Relative tolerance when comparing two estimates
+
+/**
+ * \brief Constant velocity model of the aircraft, whose state is [x, dx/dt, y, dy/dt].
+ */
+vpColVector fx(const vpColVector &chi, const double &period)
+{
+  vpColVector point(4);
+  point[0] = chi[1] * period + chi[0];
+  point[1] = chi[1];
+  point[2] = chi[3] * period + chi[2];
+  point[3] = chi[3];
+  return point;
+}
+
+/**
+ * \brief Range and elevation angle of the aircraft seen by a radar placed at the origin.
+ */
+vpColVector hx(const vpColVector &chi)
+{
+  vpColVector meas(2);
+  meas[0] = std::sqrt(chi[0] * chi[0] + chi[2] * chi[2]);
+  meas[1] = std::atan2(chi[2], chi[0]);
+  return meas;
+}
+
+void fxInPlace(const vpColVector &chi, const double &period, vpColVector &point)
+{
+  point[0] = chi[1] * period + chi[0];
+  point[1] = chi[1];
+  point[2] = chi[3] * period + chi[2];
+  point[3] = chi[3];
+}
+
+void hxInPlace(const vpColVector &chi, vpColVector &meas)
+{
+  meas[0] = std::sqrt(chi[0] * chi[0] + chi[2] * chi[2]);
+  meas[1] = std::atan2(chi[2], chi[0]);
+}
+
+vpMatrix fxBatch(const vpMatrix &chis, const double &period)
+{
+  vpMatrix points(chis.getRows(), chis.getCols());
+  for (unsigned int i = 0; i < chis.getRows(); ++i) {
+    points[i][0] = chis[i][1] * period + chis[i][0];
+    points[i][1] = chis[i][1];
+    points[i][2] = chis[i][3] * period + chis[i][2];
+    points[i][3] = chis[i][3];
+  }
+  return points;
+}
+
+vpMatrix hxBatch(const vpMatrix &chis)
+{
+  vpMatrix meas(chis.getRows(), 2);
+  for (unsigned int i = 0; i < chis.getRows(); ++i) {
+    meas[i][0] = std::sqrt(chis[i][0] * chis[i][0] + chis[i][2] * chis[i][2]);
+    meas[i][1] = std::atan2(chis[i][2], chis[i][0]);
+  }
+  return meas;
+}
+
+/**
+ * \brief Weighted mean of the measurements, written as a user would do without vpUnscentedKalman::angleMean.
+ */
+vpColVector measurementMean(const std::vector<vpColVector> &measurements, const std::vector<double> &wm)
+{
+  vpColVector mean(2, 0.);
+  double sumCos(0.);
+  double sumSin(0.);
+  for (size_t i = 0; i < measurements.size(); ++i) {
+    mean[0] += wm[i] * measurements[i][0];
+    sumCos += wm[i] * std::cos(measurements[i][1]);
+    sumSin += wm[i] * std::sin(measurements[i][1]);
+  }
+  mean[1] = std::atan2(sumSin, sumCos);
+  return mean;
+}
+
+/**
+ * \brief Residual of the measurements, written as a user would do without vpUnscentedKalman::angleResidual.
+ */
+vpColVector measurementResidual(const vpColVector &meas, const vpColVector &toSubtract)
+{
+  vpColVector res = meas - toSubtract;
+  double angle = vpMath::modulo(res[1], 2. * M_PI);
+  if (angle > M_PI) {
+    angle -= 2. * M_PI;
+  }
+  res[1] = angle;
+  return res;
+}
+
+/**
+ * \brief Simulate the noisy measurements of an aircraft flying at constant velocity.
+ */
+std::vector<vpColVector> generateMeasurements()
+{
+  vpGaussRand rngRange(5., 0., 4224);
+  vpGaussRand rngElevAngle(vpMath::rad(0.5), 0., 2112);
+  vpColVector gt(4);
+  gt[0] = -500.;
+  gt[1] = 100.;
+  gt[2] = 1000.;
+  gt[3] = 5.;
+  std::vector<vpColVector> measurements;
+  for (unsigned int i = 0; i < nbSteps; ++i) {
+    gt = fx(gt, dt);
+    vpColVector z = hx(gt);
+    z[0] += rngRange();
+    z[1] += rngElevAngle();
+    measurements.push_back(z);
+  }
+  return measurements;
+}
+
+/**
+ * \brief Build a filter for the radar scenario, using the per-point functions and the
+ * user-defined measurement mean and residual functions.
+ */
+vpUnscentedKalman createFilter(std::shared_ptr<vpUKSigmaDrawerAbstract> &drawer)
+{
+  vpMatrix R(2, 2, 0.);
+  R[0][0] = 5. * 5.;
+  R[1][1] = vpMath::rad(0.5) * vpMath::rad(0.5);
+
+  vpMatrix Q(4, 4, 0.);
+  vpMatrix Q1d(2, 2);
+  Q1d[0][0] = std::pow(dt, 3) / 3.;
+  Q1d[0][1] = std::pow(dt, 2) / 2.;
+  Q1d[1][0] = std::pow(dt, 2) / 2.;
+  Q1d[1][1] = dt;
+  Q.insert(Q1d, 0, 0);
+  Q.insert(Q1d, 2, 2);
+  Q = Q * 0.1;
+
+  vpUnscentedKalman ukf(Q, R, drawer, fx, hx);
+  ukf.setMeasurementMeanFunction(measurementMean);
+  ukf.setMeasurementResidualFunction(measurementResidual);
+  return ukf;
+}
+
+/**
+ * \brief Initialize the filter and run it on the measurements, storing the estimates of each step.
+ */
+void runFilter(vpUnscentedKalman &ukf, const std::vector<vpColVector> &measurements,
+               std::vector<vpColVector> &Xest, std::vector<vpMatrix> &Pest)
+{
+  vpColVector X0(4);
+  X0[0] = 0.9 * -500.;
+  X0[1] = 0.9 * 100.;
+  X0[2] = 0.9 * 1000.;
+  X0[3] = 0.9 * 5.;
+
+  vpMatrix P0(4, 4, 0.);
+  P0[0][0] = std::pow(300, 2);
+  P0[1][1] = std::pow(30, 2);
+  P0[2][2] = std::pow(150, 2);
+  P0[3][3] = std::pow(30, 2);
+
+  ukf.init(X0, P0);
+  Xest.clear();
+  Pest.clear();
+  for (size_t i = 0; i < measurements.size(); ++i) {
+    ukf.filter(measurements[i], dt);
+    Xest.push_back(ukf.getXest());
+    Pest.push_back(ukf.getPest());
+  }
+}
+
+bool equal(const vpArray2D<double> &A, const vpArray2D<double> &B)
+{
+  if ((A.getRows() != B.getRows()) || (A.getCols() != B.getCols())) {
+    return false;
+  }
+  for (unsigned int r = 0; r < A.getRows(); ++r) {
+    for (unsigned int c = 0; c < A.getCols(); ++c) {
+      double scale = std::max<double>(1., std::max<double>(std::fabs(A[r][c]), std::fabs(B[r][c])));
+      if (std::fabs(A[r][c] - B[r][c]) > (tolerance * scale)) {
+        std::cout << "Mismatch at (" << r << ", " << c << "): " << A[r][c] << " vs " << B[r][c] << std::endl;
+        return false;
+      }
+    }
+  }
+  return true;
+}
+
+/**
+ * \brief Check that two runs of the filter led to the same estimates at each step.
+ */
+bool equal(const std::vector<vpColVector> &XestA, const std::vector<vpMatrix> &PestA,
+           const std::vector<vpColVector> &XestB, const std::vector<vpMatrix> &PestB)
+{
+  if ((XestA.size() != XestB.size()) || (PestA.size() != PestB.size())) {
+    return false;
+  }
+  for (size_t i = 0; i < XestA.size(); ++i) {
+    if ((!equal(XestA[i], XestB[i])) || (!equal(PestA[i], PestB[i]))) {
+      std::cout << "Estimates differ at step " << i << std::endl;
+      return false;
+    }
+  }
+  return true;
+}
+}
+
+TEST_CASE("Covariance representations", "[vpUnscentedKalman][covariance]")
+{
+  std::vector<vpColVector> measurements = generateMeasurements();
+  std::shared_ptr<vpUKSigmaDrawerAbstract> drawer = std::make_shared<vpUKSigmaDrawerMerwe>(4, 0.1, 2., -1.);
+
+  std::vector<vpColVector> XestFull;
+  std::vector<vpMatrix> PestFull;
+  vpUnscentedKalman ukfFull = createFilter(drawer);
+  runFilter(ukfFull, measurements, XestFull, PestFull);
+
+  SECTION("Square root", "The lower triangular square root of the covariance is propagated")
+  {
+    std::vector<vpColVector> Xest;
+    std::vector<vpMatrix> Pest;
+    vpUnscentedKalman ukf = createFilter(drawer);
+    ukf.setCovarianceRepresentation(vpUnscentedKalman::COVARIANCE_SQUARE_ROOT);
+    runFilter(ukf, measurements, Xest, Pest);
+    CHECK(equal(XestFull, PestFull, Xest, Pest));
+  }
+
+  SECTION("LDL", "The LDL factors of the covariance are propagated")
+  {
+    std::vector<vpColVector> Xest;
+    std::vector<vpMatrix> Pest;
+    vpUnscentedKalman ukf = createFilter(drawer);
+    ukf.setCovarianceRepresentation(vpUnscentedKalman::COVARIANCE_LDL);
+    runFilter(ukf, measurements, Xest, Pest);
+    CHECK(equal(XestFull, PestFull, Xest, Pest));
+  }
+}
+
+TEST_CASE("Covariance representations at a small scale", "[vpUnscentedKalman][covariance]")
+{
+  // A 1D constant velocity model expressed in a unit such as the variances are around 1e-20:
+  // the factorized representations must not take them for zeros
+  const double scale = 1e-9;
+  vpMatrix Q(2, 2);
+  Q[0][0] = (dt * dt * dt) / 3.;
+  Q[0][1] = (dt * dt) / 2.;
+  Q[1][0] = (dt * dt) / 2.;
+  Q[1][1] = dt;
+  Q = Q * (0.01 * scale * scale);
+  vpMatrix R(1, 1);
+  R[0][0] = 0.25 * scale * scale;
+  vpMatrix P0(2, 2, 0.);
+  P0[0][0] = 4. * scale * scale;
+  P0[1][1] = scale * scale;
+  vpUnscentedKalman::vpProcessFunction f = [](const vpColVector &x, const double &period) {
+    vpColVector y(2);
+    y[0] = x[0] + (period * x[1]);
+    y[1] = x[1];
+    return y;
+    };
+  vpUnscentedKalman::vpMeasurementFunction h = [](const vpColVector &x) {
+    return vpColVector(1, x[0]);
+    };
+
+  std::vector<vpMatrix> Pest;
+  std::vector<vpUnscentedKalman::vpCovarianceRepresentation> representations;
+  representations.push_back(vpUnscentedKalman::COVARIANCE_FULL);
+  representations.push_back(vpUnscentedKalman::COVARIANCE_SQUARE_ROOT);
+  representations.push_back(vpUnscentedKalman::COVARIANCE_LDL);
+  for (size_t r = 0; r < representations.size(); ++r) {
+    std::shared_ptr<vpUKSigmaDrawerAbstract> drawer = std::make_shared<vpUKSigmaDrawerMerwe>(2, 0.3, 2., 1.);
+    vpUnscentedKalman ukf(Q, R, drawer, f, h);
+    ukf.setCovarianceRepresentation(representations[r]);
+    ukf.init(vpColVector(2, 0.), P0);
+    for (unsigned int i = 0; i < nbSteps; ++i) {
+      ukf.filter(vpColVector(1, scale * ((0.5 * i) + (0.1 * ((i % 3) - 1.)))), dt);
+    }
+    // Compared in the unit of the model, as equal() uses an absolute tolerance for small values
+    Pest.push_back(ukf.getPest() * (1. / (scale * scale)));
+  }
+  CHECK(equal(Pest[0], Pest[1]));
+  CHECK(equal(Pest[0], Pest[2]));
+}
+
+TEST_CASE("Process and measurement functions", "[vpUnscentedKalman][functions]")
+{
+  std::vector<vpColVector> measurements = generateMeasurements();
+  std::shared_ptr<vpUKSigmaDrawerAbstract> drawer = std::make_shared<vpUKSigmaDrawerMerwe>(4, 0.1, 2., -1.);
+
+  std::vector<vpColVector> XestRef;
+  std::vector<vpMatrix> PestRef;
+  vpUnscentedKalman ukfRef = createFilter(drawer);
+  runFilter(ukfRef, measurements, XestRef, PestRef);
+
+  SECTION("Batch", "All the sigma points are projected at once")
+  {
+    std::vector<vpColVector> Xest;
+    std::vector<vpMatrix> Pest;
+    vpUnscentedKalman ukf = createFilter(drawer);
+    ukf.setProcessBatchFunction(fxBatch);
+    ukf.setMeasurementBatchFunction(hxBatch);
+    runFilter(ukf, measurements, Xest, Pest);
+    CHECK(equal(XestRef, PestRef, Xest, Pest));
+  }
+
+  SECTION("In-place", "The projections are written in vectors allocated by the filter")
+  {
+    std::vector<vpColVector> Xest;
+    std::vector<vpMatrix> Pest;
+    vpUnscentedKalman ukf = createFilter(drawer);
+    ukf.setProcessInPlaceFunction(fxInPlace);
+    ukf.setMeasurementInPlaceFunction(hxInPlace);
+    runFilter(ukf, measurements, Xest, Pest);
+    CHECK(equal(XestRef, PestRef, Xest, Pest));
+  }
+
+  SECTION("Angle indices", "The measurement mean and residual functions are the built-in ones")
+  {
+    std::vector<vpColVector> Xest;
+    std::vector<vpMatrix> Pest;
+    vpUnscentedKalman ukf = createFilter(drawer);
+    ukf.setMeasurementAngleIndices(std::vector<unsigned int>(1, 1));
+    runFilter(ukf, measurements, Xest, Pest);
+    CHECK(equal(XestRef, PestRef, Xest, Pest));
+  }
+}
+
+TEST_CASE("Angle wrapping", "[vpUnscentedKalman][angles]")
+{
+  std::vector<unsigned int> angleIndices(1, 1);
+
+  SECTION("Mean", "The mean of angles on both sides of Pi is close to Pi")
+  {
+    vpColVector a(2), b(2);
+    a[0] = 1.; a[1] = M_PI - 0.1;
+    b[0] = 3.; b[1] = -M_PI + 0.1;
+    std::vector<vpColVector> vals;
+    vals.push_back(a);
+    vals.push_back(b);
+    std::vector<double> wm(2, 0.5);
+    vpColVector mean = vpUnscentedKalman::angleMean(vals, wm, angleIndices);
+    CHECK(vpMath::equal(mean[0], 2., 1e-12));
+    CHECK(vpMath::equal(std::fabs(mean[1]), M_PI, 1e-12));
+
+    wm[0] = 0.75;
+    wm[1] = 0.25;
+    mean = vpUnscentedKalman::angleMean(vals, wm, angleIndices);
+    CHECK(vpMath::equal(mean[0], 1.5, 1e-12));
+    CHECK(mean[1] > (M_PI - 0.1));
+    CHECK(mean[1] <= M_PI);
+  }
+
+  SECTION("Residual", "The residual of angles is brought back in [-Pi; Pi]")
+  {
+    vpColVector a(2), b(2);
+    a[0] = 5.; a[1] = M_PI - 0.1;
+    b[0] = 2.; b[1] = -M_PI + 0.1;
+    vpColVector res = vpUnscentedKalman::angleResidual(a, b, angleIndices);
+    CHECK(vpMath::equal(res[0], 3., 1e-12));
+    CHECK(vpMath::equal(res[1], -0.2, 1e-12));
+
+    res = vpUnscentedKalman::angleResidual(b, a, angleIndices);
+    CHECK(vpMath::equal(res[0], -3., 1e-12));
+    CHECK(vpMath::equal(res[1], 0.2, 1e-12));
+
+    a[1] = 0.3;
+    b[1] = 0.1;
+    res = vpUnscentedKalman::angleResidual(a, b, angleIndices);
+    CHECK(vpMath::equal(res[1], 0.2, 1e-12));
+  }
+}
+
+int main(int argc, char *argv[])
+{
+  Catch::Session session;
+  session.applyCommandLine(argc, argv);
+
+  int numFailed = session.run();
+  return numFailed;
+}
+
+#else
+#include <iostream>
+
+int main() { return EXIT_SUCCESS; }
+#endif
@@ -156,6 +156,7 @@ public:
   void navigate(void);
 
   void plot(unsigned int graphNum, unsigned int curveNum, double x, double y);
+  void plot(unsigned int graphNum, unsigned int curveNum, const vpColVector &v_x, const vpColVector &v_y);
   void plot(unsigned int graphNum, double x, const vpColVector &v_y);
   void plot(unsigned int graphNum, double x, const vpRowVector &v_y);
   void plot(unsigned int graphNum, double x, const vpPoseVector &v_y);
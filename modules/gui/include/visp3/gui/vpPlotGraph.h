@@ -38,6 +38,7 @@
 
 #ifndef DOXYGEN_SHOULD_SKIP_THIS
 
+#include <visp3/core/vpColVector.h>
 #include <visp3/core/vpColor.h>
 #include <visp3/core/vpImage.h>
 
@@ -198,6 +199,7 @@ public:
   vpHomogeneousMatrix navigation(const vpImage<unsigned char> &I, bool &changed, vpMouseButton::vpMouseButtonType &b);
 
   void plot(vpImage<unsigned char> &I, unsigned int curveNb, double x, double y);
+  void plot(vpImage<unsigned char> &I, unsigned int curveNb, const vpColVector &v_x, const vpColVector &v_y);
   vpMouseButton::vpMouseButtonType plot(vpImage<unsigned char> &I, unsigned int curveNb, double x, double y, double z);
   void replot(vpImage<unsigned char> &I);
   void replot3D(vpImage<unsigned char> &I);
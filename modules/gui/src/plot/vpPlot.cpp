@@ -274,6 +274,27 @@ void vpPlot::plot(unsigned int graphNum, unsigned int curveNum, double x, double
   (graphList + graphNum)->plot(I, curveNum, x, y);
 }
 
+/*!
+  This function enables you to add several new points in the curve at once,
+  e.g. a whole time series that has been recorded beforehand. These points are
+  drawn with the parameters of the curve. The scale is adapted to all the points
+  before the graphic is drawn and flushed once.
+
+  \param graphNum : The index of the graph in the window. As the number of
+  graphic in a window is less or equal to 4, this parameter is between 0 and 3.
+  \param curveNum : The index of the curve in the list of the curves belonging to the graphic.
+  \param v_x : The coordinates of the new points along the x axis and given in the user unit system.
+  \param v_y : The coordinates of the new points along the y axis and given in the user unit system.
+  It must have the same size as \e v_x.
+*/
+void vpPlot::plot(unsigned int graphNum, unsigned int curveNum, const vpColVector &v_x, const vpColVector &v_y)
+{
+  if (v_x.getRows() != v_y.getRows()) {
+    throw(vpException(vpException::dimensionError, "Error in plot vector: not the right dimension"));
+  }
+  (graphList + graphNum)->plot(I, curveNum, v_x, v_y);
+}
+
 /*!
   This function enables you to add new points in all curves of a plot. These
   points are drawn with the parameters of the curves.
@@ -534,6 +534,59 @@ void vpPlotGraph::plot(vpImage<unsigned char> &I, unsigned int curveNb, double x
 #endif
 }
 
+void vpPlotGraph::plot(vpImage<unsigned char> &I, unsigned int curveNb, const vpColVector &v_x, const vpColVector &v_y)
+{
+  if (v_x.getRows() == 0) {
+    return;
+  }
+
+  // Grow the scale to fit all the points and append them to the curve without drawing,
+  // the whole graph is then drawn and flushed once by replot()
+  for (unsigned int k = 0; k < v_x.getRows(); ++k) {
+    double x = v_x[k];
+    double y = v_y[k];
+    if (!scaleInitialized) {
+      if (x < 0) {
+        xmax = 0;
+        rescalex(0, x);
+      }
+      if (x > 0) {
+        xmin = 0;
+        rescalex(1, x);
+      }
+      if (y < 0) {
+        ymax = 0;
+        rescaley(0, y);
+      }
+      if (y > 0) {
+        ymin = 0;
+        rescaley(1, y);
+      }
+      // if (y == 0)
+      scaleInitialized = !(std::fabs(y) <= std::numeric_limits<double>::epsilon());
+    }
+
+    if (x > xmax)
+      rescalex(1, x);
+    else if (x < xmin)
+      rescalex(0, x);
+
+    if (y > ymax)
+      rescaley(1, y);
+    else if (y < ymin)
+      rescaley(0, y);
+
+    (curveList + curveNb)->pointListx.push_back(x);
+    (curveList + curveNb)->pointListy.push_back(y);
+    (curveList + curveNb)->pointListz.push_back(0.0);
+    (curveList + curveNb)->nbPoint++;
+  }
+
+  computeGraphParameters();
+  replot(I);
+  firstPoint = false;
+}
+
 void vpPlotGraph::replot(vpImage<unsigned char> &I)
 {
   clearGraphZone(I);
@@ -40,6 +40,7 @@
 #include "core/pixel_meter.hpp"
 #include "core/image_conversions.hpp"
 #include "core/display.hpp"
+#include "core/kalman.hpp"
 
 
 
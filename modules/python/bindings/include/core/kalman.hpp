@@ -0,0 +1,99 @@
+/*
+ * ViSP, open source Visual Servoing Platform software.
+ * Copyright (C) 2005 - 2024 by Inria. All rights reserved.
+ *
+ * This software is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 2 of the License, or
+ * (at your option) any later version.
+ * See the file LICENSE.txt at the root directory of this source
+ * distribution for additional information about the GNU GPL.
+ *
+ * For using ViSP with software that can not be combined with the GNU
+ * GPL, please contact Inria about acquiring a ViSP Professional
+ * Edition License.
+ *
+ * See https://visp.inria.fr for more information.
+ *
+ * This software was developed at:
+ * Inria Rennes - Bretagne Atlantique
+ * Campus Universitaire de Beaulieu
+ * 35042 Rennes Cedex
+ * France
+ *
+ * If you have questions regarding the use of this file, please contact
+ * Inria at visp@inria.fr
+ *
+ * This file is provided AS IS with NO WARRANTY OF ANY KIND, INCLUDING THE
+ * WARRANTY OF DESIGN, MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE.
+ *
+ * Description:
+ * Python bindings.
+ */
+
+#ifndef VISP_PYTHON_CORE_KALMAN_HPP
+#define VISP_PYTHON_CORE_KALMAN_HPP
+
+#include <pybind11/pybind11.h>
+#include <pybind11/functional.h>
+
+#include <visp3/core/vpConfig.h>
+#include <visp3/core/vpUnscentedKalman.h>
+
+namespace py = pybind11;
+
+/*
+ * The in-place functions receive the vector in which they must write as a non-const reference.
+ * The default conversion of a C++ reference to a Python callback argument is a copy: the writes would be lost.
+ * The vectors are thus passed to the callbacks by reference, and are only valid during the call.
+ */
+void bindings_vpUnscentedKalman(py::class_<vpUnscentedKalman, std::shared_ptr<vpUnscentedKalman>> &pyUnscentedKalman)
+{
+  pyUnscentedKalman.def("setProcessInPlaceFunction", [](vpUnscentedKalman &self, const py::object &fInPlace) {
+    if (fInPlace.is_none()) {
+      self.setProcessInPlaceFunction(nullptr);
+      return;
+    }
+    py::function f = fInPlace.cast<py::function>();
+    self.setProcessInPlaceFunction([f](const vpColVector &chi, const double &dt, vpColVector &point) {
+      py::gil_scoped_acquire gil;
+      f(py::cast(chi, py::return_value_policy::reference), dt, py::cast(point, py::return_value_policy::reference));
+    });
+  }, R"doc(
+Set a process function that writes the projection of a sigma point in a vector that is allocated
+once by the filter and reused at each step. When set, it is used instead of the process function given
+to the constructor. The batch process function, if set, takes precedence over it.
+
+The function is called as fInPlace(chi, dt, point) and must write its result in point, e.g. with point[0] = ...
+chi and point refer to the memory of the filter: they must not be kept after the call, and chi must not be modified.
+
+:param fInPlace: The in-place process function to use. Set it to None to go back to the
+    process function given to the constructor.
+
+)doc", py::arg("fInPlace"));
+
+  pyUnscentedKalman.def("setMeasurementInPlaceFunction", [](vpUnscentedKalman &self, const py::object &hInPlace) {
+    if (hInPlace.is_none()) {
+      self.setMeasurementInPlaceFunction(nullptr);
+      return;
+    }
+    py::function h = hInPlace.cast<py::function>();
+    self.setMeasurementInPlaceFunction([h](const vpColVector &chi, vpColVector &meas) {
+      py::gil_scoped_acquire gil;
+      h(py::cast(chi, py::return_value_policy::reference), py::cast(meas, py::return_value_policy::reference));
+    });
+  }, R"doc(
+Set a measurement function that writes the projection of a prior point in a vector that is allocated
+once by the filter and reused at each step. When set, it is used instead of the measurement function given
+to the constructor. The batch measurement function, if set, takes precedence over it.
+
+The function is called as hInPlace(chi, meas) and must write its result in meas, e.g. with meas[0] = ...
+chi and meas refer to the memory of the filter: they must not be kept after the call, and chi must not be modified.
+
+:param hInPlace: The in-place measurement function to use. Set it to None to go back to the
+    measurement function given to the constructor.
+
+)doc", py::arg("hInPlace"));
+}
+
+#endif
@@ -68,57 +68,11 @@
 """
 
 from visp.core import ColVector, Matrix, UnscentedKalman, UKSigmaDrawerMerwe, Math
+import argparse
+from functools import lru_cache
+from math import atan2, hypot
 import numpy as np
-from typing import List
-
-# For the Graphical User Interface
-try:
-  from visp.gui import Plot
-  has_gui = True
-except:
-  has_gui = False
-import numpy as np
-
-def normalize_angle(angle: float) -> float:
-  angle_0_to_2pi = Math.modulo(angle, 2. * np.pi)
-  angle_MinPi_Pi = angle_0_to_2pi
-  if angle_MinPi_Pi > np.pi:
-    # Substract 2 PI to be in interval [-Pi; Pi]
-    angle_MinPi_Pi = angle_MinPi_Pi - 2. * np.pi
-  return angle_MinPi_Pi
-
-def measurement_mean(measurements: List[ColVector], wm: List[float]) -> ColVector:
-  """
-  Compute the weighted mean of measurement vectors.
-
-  :param measurements: The measurement vectors, such as measurements[i][0] = range and
-   measurements[i][1] = elevation_angle.
-  :param wm: The associated weights.
-
-  :return vpColVector: The weighted mean of the measurement vectors.
-  """
-  wm_np = np.array(wm)
-  ranges = np.array([meas[0] for meas in measurements])
-  elev_angles = np.array([meas[1] for meas in measurements])
-  meanRange = (wm_np * ranges).sum()
-  sum_cos = (wm_np * np.cos(elev_angles)).sum()
-  sum_sin = (wm_np * np.sin(elev_angles)).sum()
-  mean_angle = np.arctan2(sum_sin, sum_cos)
-
-  return ColVector([meanRange, mean_angle])
-
-def measurementResidual(meas: ColVector, to_subtract: ColVector) -> ColVector:
-  """
-  Compute the subtraction between two vectors expressed in the measurement space,
-   such as v[0] = range ; v[1] = elevation_angle
-
-  :param meas: Measurement to which we must subtract something.
-  :param toSubtract: The something we must subtract.
-
-  :return vpColVector: \b meas - \b toSubtract .
-  """
-  res_temp = meas - to_subtract
-  return ColVector([res_temp[0], normalize_angle(res_temp[1])])
+import sys
 
 def state_add_vectors(a, b) -> ColVector:
   """
@@ -158,12 +112,39 @@ def fx(x: ColVector, dt: float) -> ColVector:
   	x[3]
   ])
 
+@lru_cache(maxsize=None)
+def process_matrix_transpose(dt: float) -> np.ndarray:
+  """
+  Compute the transpose of the matrix F of the constant velocity model, such as fx(x, dt) = F x.
+  It is computed only once per sampling time.
+
+  :param dt: The sampling time.
+
+  :return np.ndarray: The transpose of F.
+  """
+  F = np.eye(4)
+  F[0, 1] = dt
+  F[2, 3] = dt
+  return F.T
+
+def fx_batch(X: Matrix, dt: float) -> Matrix:
+  """
+  Process function that projects in time all the sigma points at once.
+
+  :param X: The sigma points, such as X[i] is the i-th sigma point.
+  :param dt: The sampling time: how far in the future are we projecting the sigma points.
+
+  :return Matrix: The sigma points projected in time, such as the i-th row is the projection of X[i].
+  """
+  # As the sigma points are stored in the rows of X, the projection is X F^T
+  return Matrix(np.array(X, copy=False) @ process_matrix_transpose(dt))
+
 class vpRadarStation:
   """
   Class that permits to convert the position of the aircraft into
   range and elevation angle measurements.
   """
-  def __init__(self, x: float, y: float, range_std: float, elev_angle_std: float):
+  def __init__(self, x: float, y: float, range_std: float, elev_angle_std: float, rng: np.random.Generator, nb_steps: int):
     """
     Construct a new vpRadarStation
 
@@ -171,11 +152,16 @@ class vpRadarStation:
     :param y: The altitude of the radar.
     :param range_std: The standard deviation of the range measurements.
     :param elev_angle_std: The standard deviation of the elevation angle measurements.
+    :param rng: The random generator used to draw the measurement noise.
+    :param nb_steps: The number of noisy measurements that will be performed.
     """
     self._x = x
     self._y = y
     self._stdevRange = range_std
     self._stdevElevAngle = elev_angle_std
+    # Drawing all the noise samples at once rather than one at a time
+    self._range_noise = rng.normal(0., range_std, nb_steps)
+    self._elev_angle_noise = rng.normal(0., elev_angle_std, nb_steps)
 
   def state_to_measurement(self, x: ColVector) -> ColVector:
     """
@@ -187,10 +173,25 @@ class vpRadarStation:
     """
     dx = x[0] - self._x
     dy = x[2] - self._y
-    range = np.sqrt(dx * dx + dy * dy)
-    elev_angle = np.arctan2(dy, dx)
+    range = hypot(dx, dy)
+    elev_angle = atan2(dy, dx)
     return ColVector([range, elev_angle])
 
+  def state_to_measurement_batch(self, X: Matrix) -> Matrix:
+    """
+    Measurement function that expresses all the sigma points of the prior in the measurement space at once.
+
+    :param X: The sigma points of the prior, such as X[i] is the i-th point.
+
+    :return Matrix: The points expressed in the measurement space, such as the i-th row corresponds to X[i].
+    """
+    X_np = np.array(X, copy=False)
+    dx = X_np[:, 0] - self._x
+    dy = X_np[:, 2] - self._y
+    ranges = np.hypot(dx, dy)
+    elev_angles = np.arctan2(dy, dx)
+    return Matrix(np.column_stack((ranges, elev_angles)))
+
   def measure_gt(self, pos: ColVector) -> ColVector:
     """
     Perfect measurement of the range and elevation angle that
@@ -203,21 +204,22 @@ class vpRadarStation:
     """
     dx = pos[0] - self._x
     dy = pos[1] - self._y
-    range = np.sqrt(dx * dx + dy * dy)
-    elev_angle = np.arctan2(dy, dx)
+    range = hypot(dx, dy)
+    elev_angle = atan2(dy, dx)
     return ColVector([range, elev_angle])
 
-  def measure_with_noise(self, pos: ColVector) -> ColVector:
+  def measure_with_noise(self, pos: ColVector, i: int) -> ColVector:
     """
     Noisy measurement of the range and elevation angle that
     correspond to pos.
 
     :param pos: The actual position of the aircraft (pos[0]: projection of the position
      on the ground, pos[1]: altitude).
+    :param i: The index of the measurement, used to pick the noise sample.
     :return vpColVector: [0] the range [1] the elevation angle.
     """
     measurements_GT = self.measure_gt(pos)
-    measurements_noisy = ColVector([measurements_GT[0] + np.random.normal(0., self._stdevRange), measurements_GT[1] + np.random.normal(0., self._stdevElevAngle)])
+    measurements_noisy = ColVector([measurements_GT[0] + self._range_noise[i], measurements_GT[1] + self._elev_angle_noise[i]])
     return measurements_noisy
 
 class vpACSimulator:
@@ -225,32 +227,50 @@ class vpACSimulator:
   Class to simulate a flying aircraft.
   """
 
-  def __init__(self, X0: ColVector, vel: ColVector, vel_std: float):
+  def __init__(self, X0: ColVector, vel: ColVector, vel_std: float, rng: np.random.Generator, nb_steps: int):
     """
     Construct a new vpACSimulator object.
 
     :param X0: Initial position of the aircraft.
     :param vel: Velocity of the aircraft.
     :param vel_std: Standard deviation of the variation of the velocity.
+    :param rng: The random generator used to draw the variations of the velocity.
+    :param nb_steps: The number of updates that will be performed.
     """
     self._pos = X0 # Position of the simulated aircraft
     self._vel = vel # Velocity of the simulated aircraft
-    np.random.seed(4224)
     self._stdevVel = vel_std # Standard deviation of the random generator for slight variations of the velocity of the aircraft
+    self._vel_noise = rng.normal(0., vel_std, size=(nb_steps, 2)) # Variations of the velocity, drawn all at once
 
 
-  def update(self, dt: float) -> ColVector:
+  def update(self, dt: float, i: int, out: ColVector) -> ColVector:
     """
     Compute the new position of the aircraft after dt seconds have passed
     since the last update.
 
     :param dt: Period since the last update.
-    :return ColVector: The new position of the aircraft.
+    :param i: The index of the update, used to pick the variation of the velocity.
+    :param out: A 2-dimensional vector in which the new position is written, to avoid allocating a new one.
+    :return ColVector: The new position of the aircraft, i.e. out.
     """
-    dx_temp = self._vel * dt
-    dx = ColVector([dx_temp[0] + np.random.normal(0., self._stdevVel) * dt, dx_temp[1] + np.random.normal(0., self._stdevVel) * dt])
-    self._pos += dx
-    return self._pos
+    self._pos[0] += (self._vel[0] + self._vel_noise[i, 0]) * dt
+    self._pos[1] += (self._vel[1] + self._vel_noise[i, 1]) * dt
+    out[0] = self._pos[0]
+    out[1] = self._pos[1]
+    return out
+
+def try_import_plot():
+  """
+  Import the plotting tool of the Graphical User Interface, only when it is needed
+  as it may pull heavy dependencies.
+
+  :return: The visp.gui.Plot class, or None if it is not available.
+  """
+  try:
+    from visp.gui import Plot
+    return Plot
+  except ImportError:
+    return None
 
 def generate_Q_matrix(dt: float) -> Matrix:
   """
@@ -280,6 +300,14 @@ def generate_P0_matrix() -> Matrix:
   	[0, 0, 0, 30*30]])
 
 if __name__ == '__main__':
+  parser = argparse.ArgumentParser(description='Non-linear use-case of the Unscented Kalman Filter: tracking an aircraft with a radar station.')
+  parser.add_argument('--no-plot', action='store_true', help='Disable plots')
+
+  args, unknown_args = parser.parse_known_args()
+  if unknown_args:
+    print("The following args are not recognized and will not be used: %s" % unknown_args)
+    sys.exit()
+
   dt = 3. # The sampling period
   gt_X_init = -500. # Ground truth initial position along the X-axis, in meters
   gt_Y_init = 1000. # Ground truth initial position along the Y-axis, in meters
@@ -290,24 +318,37 @@ if __name__ == '__main__':
   sigma_elev_angle = Math.rad(0.5) # Standard deviation of the elevation angle measurent: 0.5deg
   stdev_aircraft_velocity = 0.2; # Standard deviation of the velocity of the simulated aircraft,
                                # to make it deviate a bit from the constant velocity model
+  nb_steps = 500 # The number of steps of the simulation
+  meas_period = 1 # A new radar measurement is available every meas_period steps, the UKF only predicts in-between
+  rng = np.random.default_rng(4224) # The random generator used to simulate the noise
 
   # The object that draws the sigma points used by the UKF
   drawer = UKSigmaDrawerMerwe(n=4, alpha=0.3, beta=2, kappa=-1, resFunc=state_residual_vectors, addFunc=state_add_vectors)
 
   # The object that performs radar measurements
-  radar = vpRadarStation(0., 0., sigma_range, sigma_elev_angle)
+  radar = vpRadarStation(0., 0., sigma_range, sigma_elev_angle, rng, nb_steps)
 
   P0 = generate_P0_matrix() # The initial estimate of the state covariance matrix
   R = Matrix([[sigma_range * sigma_range, 0], [0, sigma_elev_angle * sigma_elev_angle]]) # The measurement covariance matrix
   Q = generate_Q_matrix(dt) * proc_var # The process covariance matrix
   ukf = UnscentedKalman(Q, R, drawer, fx, radar.state_to_measurement) # The Unscented Kalman Filter instance
 
+  # The filter propagates the state covariance matrix itself by default. Its square root or LDL factors
+  # can be propagated instead, e.g. ukf.setCovarianceRepresentation(UnscentedKalman.COVARIANCE_LDL),
+  # as long as P0, Q and R are positive definite
+
   # Initializing the state vector and state covariance matrix estimates
   ukf.init(ColVector([0.9 * gt_X_init, 0.9 * gt_vX_init, 0.9 * gt_Y_init, 0.9 * gt_vY_init]), P0)
-  ukf.setMeasurementMeanFunction(measurement_mean)
-  ukf.setMeasurementResidualFunction(measurementResidual)
-
-  # Initializing the Graphical User Interface if the needed libraries are available
+  # The second component of the measurements is an angle: its mean and residuals are computed
+  # by the C++ functions of the UKF, which avoids calling Python functions at each step
+  ukf.setMeasurementAngleIndices([1])
+  # Projecting all the sigma points in a single call rather than one call per sigma point
+  ukf.setProcessBatchFunction(fx_batch)
+  ukf.setMeasurementBatchFunction(radar.state_to_measurement_batch)
+
+  # Initializing the Graphical User Interface if it is wanted and the needed libraries are available
+  Plot = None if args.no_plot else try_import_plot()
+  has_gui = Plot is not None
   if has_gui:
     num_plots = 4
     plot = Plot(num_plots)
@@ -332,36 +373,44 @@ if __name__ == '__main__':
 
   ac_pos = ColVector([gt_X_init, gt_Y_init]) # Ground truth position
   ac_vel = ColVector([gt_vX_init, gt_vY_init]) # Ground truth velocity
-  ac = vpACSimulator(ac_pos, ac_vel, stdev_aircraft_velocity)
-  gt_X_prev = ColVector([ac_pos[0], ac_pos[1]]) # Previous ground truth position
-  for i in range(500):
+  ac = vpACSimulator(ac_pos, ac_vel, stdev_aircraft_velocity, rng, nb_steps)
+  gt_X = ColVector(ac_pos) # Current ground truth position
+  gt_X_prev = ColVector(ac_pos) # Previous ground truth position
+  # The ground truth and filtered states are recorded during the simulation and plotted at once at the end,
+  # such as gt_states[i] = [x, vx, y, vy] at the i-th step
+  gt_states = np.empty((nb_steps, 4))
+  est_states = np.empty((nb_steps, 4))
+  for i in range(nb_steps):
     # Creating noisy measurements
-    gt_X = ac.update(dt)
+    ac.update(dt, i, gt_X)
     gt_V = (gt_X - gt_X_prev) / dt
-    z = radar.measure_with_noise(gt_X)
-
-    # Filtering using the UKF
-    ukf.filter(z, dt)
-
-    # Getting the filtered state vector
-    Xest = ukf.getXest()
-
-    # Update the GUI if available
-    if has_gui:
-      plot.plot(0, 0, i, gt_X[0])
-      plot.plot(0, 1, i, Xest[0])
-
-      plot.plot(1, 0, i, gt_V[0])
-      plot.plot(1, 1, i, Xest[1])
-
-      plot.plot(2, 0, i, gt_X[1])
-      plot.plot(2, 1, i, Xest[2])
-
-      plot.plot(3, 0, i, gt_V[1])
-      plot.plot(3, 1, i, Xest[3])
-
-    # Updating last measurement for future computation of the noisy velocity
-    gt_X_prev = ColVector([gt_X[0], gt_X[1]])
+    z = radar.measure_with_noise(gt_X, i)
+
+    # Filtering using the UKF: the prediction is performed at each step, while the
+    # correction is performed only when a new measurement is available
+    ukf.predict(dt)
+    if (i + 1) % meas_period == 0:
+      ukf.update(z)
+      # Getting the filtered state vector
+      Xest = ukf.getXest()
+    else:
+      # Getting the predicted state vector
+      Xest = ukf.getXpred()
+
+    # Recording the states for the GUI
+    gt_states[i] = [gt_X[0], gt_V[0], gt_X[1], gt_V[1]]
+    est_states[i] = Xest
+
+    # Updating last measurement for future computation of the noisy velocity, by swapping
+    # the buffers rather than copying: gt_X will be overwritten by the next update
+    gt_X, gt_X_prev = gt_X_prev, gt_X
 
   print('Finished')
-  input('Press enter to quit')
+
+  # Update the GUI if available, with a single call per curve
+  if has_gui:
+    steps = ColVector(np.arange(nb_steps, dtype=np.float64))
+    for plot_index in range(num_plots):
+      plot.plot(plot_index, 0, steps, ColVector(gt_states[:, plot_index]))
+      plot.plot(plot_index, 1, steps, ColVector(est_states[:, plot_index]))
+    input('Press enter to quit')
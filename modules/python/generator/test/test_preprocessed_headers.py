@@ -0,0 +1,86 @@
+#############################################################################
+#
+# ViSP, open source Visual Servoing Platform software.
+# Copyright (C) 2005 - 2023 by Inria. All rights reserved.
+#
+# This software is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+# See the file LICENSE.txt at the root directory of this source
+# distribution for additional information about the GNU GPL.
+#
+# For using ViSP with software that can not be combined with the GNU
+# GPL, please contact Inria about acquiring a ViSP Professional
+# Edition License.
+#
+# See https://visp.inria.fr for more information.
+#
+# This software was developed at:
+# Inria Rennes - Bretagne Atlantique
+# Campus Universitaire de Beaulieu
+# 35042 Rennes Cedex
+# France
+#
+# If you have questions regarding the use of this file, please contact
+# Inria at visp@inria.fr
+#
+# This file is provided AS IS with NO WARRANTY OF ANY KIND, INCLUDING THE
+# WARRANTY OF DESIGN, MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+# Description:
+# ViSP Python bindings generator test
+#
+#############################################################################
+
+import pickle
+from pathlib import Path
+from types import SimpleNamespace
+
+from visp_python_bindgen.gen_report import Report
+from visp_python_bindgen.header import HeaderFile
+from visp_python_bindgen.header_utils import restore_preprocessed_headers
+
+def make_submodule(name: str) -> SimpleNamespace:
+  '''
+  Stand-in for Submodule: only its name and report are needed by HeaderFile
+  '''
+  submodule = SimpleNamespace(name=name)
+  submodule.report = Report(submodule)
+  return submodule
+
+def test_restore_preprocessed_headers_attaches_original_submodules():
+  '''
+  Headers come back from the preprocessing workers with their own copy of the submodule:
+  what is reported while generating the bindings should still reach the original submodule
+  '''
+  core = make_submodule('core')
+  vision = make_submodule('vision')
+  headers = [HeaderFile(Path('vpA.h'), core), HeaderFile(Path('vpB.h'), vision), HeaderFile(Path('vpC.h'), core)]
+  # Same round trip as the multiprocessing pool, returned in completion order
+  preprocessed = [pickle.loads(pickle.dumps(header)) for header in reversed(headers)]
+  assert all(header.submodule is not core and header.submodule is not vision for header in preprocessed)
+
+  restored = restore_preprocessed_headers(headers, preprocessed)
+  assert [header.path.name for header in restored] == ['vpA.h', 'vpB.h', 'vpC.h']
+  assert all(any(header is p for p in preprocessed) for header in restored)
+  assert all(header.submodule is submodule for header, submodule in zip(restored, [core, vision, core]))
+
+  for header in restored:
+    header.submodule.report.add_ignored_header(header.path)
+  assert core.report.result['ignored_headers'] == ['vpA.h', 'vpC.h']
+  assert vision.report.result['ignored_headers'] == ['vpB.h']
+
+def test_prune_cache_keeps_only_used_entries(tmp_path: Path):
+  '''
+  Cache entries written for other versions of the headers or of the generator are removed after preprocessing
+  '''
+  core = make_submodule('core')
+  used = HeaderFile(Path('vpA.h'), core)
+  used.cache_path = tmp_path / 'used.pkl'
+  not_preprocessed = HeaderFile(Path('vpB.h'), core)
+  for name in ['used.pkl', 'stale.pkl', 'interrupted.pkl.tmp', 'vpA.h.in']:
+    (tmp_path / name).write_bytes(b'')
+
+  HeaderFile.prune_cache([used, not_preprocessed])
+  assert sorted(path.name for path in tmp_path.iterdir()) == ['used.pkl', 'vpA.h.in']
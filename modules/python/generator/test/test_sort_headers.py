@@ -0,0 +1,94 @@
+#############################################################################
+#
+# ViSP, open source Visual Servoing Platform software.
+# Copyright (C) 2005 - 2023 by Inria. All rights reserved.
+#
+# This software is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+# See the file LICENSE.txt at the root directory of this source
+# distribution for additional information about the GNU GPL.
+#
+# For using ViSP with software that can not be combined with the GNU
+# GPL, please contact Inria about acquiring a ViSP Professional
+# Edition License.
+#
+# See https://visp.inria.fr for more information.
+#
+# This software was developed at:
+# Inria Rennes - Bretagne Atlantique
+# Campus Universitaire de Beaulieu
+# 35042 Rennes Cedex
+# France
+#
+# If you have questions regarding the use of this file, please contact
+# Inria at visp@inria.fr
+#
+# This file is provided AS IS with NO WARRANTY OF ANY KIND, INCLUDING THE
+# WARRANTY OF DESIGN, MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+# Description:
+# ViSP Python bindings generator test
+#
+#############################################################################
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List
+
+from visp_python_bindgen.header_utils import sort_headers
+
+@dataclass
+class FakeHeader:
+  '''
+  Stand-in for HeaderFile: sort_headers only looks at the defined and required classes
+  '''
+  path: Path
+  contains: List[str] = field(default_factory=list)
+  depends: List[str] = field(default_factory=list)
+
+def names(headers: List[FakeHeader]) -> List[str]:
+  return [h.path.name for h in headers]
+
+def test_sort_headers_dependency_chain():
+  '''
+  Base classes should be generated before the classes that inherit from them, whatever the input order
+  '''
+  a = FakeHeader(Path('vpA.h'), ['vpA'])
+  b = FakeHeader(Path('vpB.h'), ['vpB'], ['vpA'])
+  c = FakeHeader(Path('vpC.h'), ['vpC'], ['vpB'])
+  assert names(sort_headers([c, b, a])) == ['vpA.h', 'vpB.h', 'vpC.h']
+  assert names(sort_headers([a, b, c])) == ['vpA.h', 'vpB.h', 'vpC.h']
+
+def test_sort_headers_keeps_input_order_of_independent_headers():
+  '''
+  Headers that do not depend on each other keep their relative order, so that the generated code is stable
+  '''
+  a = FakeHeader(Path('vpA.h'), ['vpA'])
+  x = FakeHeader(Path('vpX.h'), ['vpX'])
+  b = FakeHeader(Path('vpB.h'), ['vpB'], ['vpA'])
+  y = FakeHeader(Path('vpY.h'), ['vpY'])
+  assert names(sort_headers([b, x, a, y])) == ['vpX.h', 'vpA.h', 'vpY.h', 'vpB.h']
+
+def test_sort_headers_ignores_missing_and_self_dependencies():
+  '''
+  Dependencies on classes defined in the same header or in no header at all do not constrain the order
+  '''
+  a = FakeHeader(Path('vpA.h'), ['vpA', 'vpABase'], ['vpABase', 'vpNotBound'])
+  b = FakeHeader(Path('vpB.h'), ['vpB'], ['vpA'])
+  assert names(sort_headers([b, a])) == ['vpA.h', 'vpB.h']
+
+def test_sort_headers_cycle_is_appended_with_warning(caplog):
+  '''
+  Headers caught in a dependency cycle, and those that depend on them, cannot be sorted:
+  they are appended, in input order, after the sorted headers
+  '''
+  a = FakeHeader(Path('vpA.h'), ['vpA'])
+  c1 = FakeHeader(Path('vpC1.h'), ['vpC1'], ['vpC2'])
+  c2 = FakeHeader(Path('vpC2.h'), ['vpC2'], ['vpC1', 'vpA'])
+  d = FakeHeader(Path('vpD.h'), ['vpD'], ['vpC1'])
+  result = sort_headers([d, c2, a, c1])
+  assert names(result) == ['vpA.h', 'vpD.h', 'vpC2.h', 'vpC1.h']
+  assert 'Could not completely solve dependencies' in caplog.text
+  assert "'vpC1.h'" in caplog.text and "'vpC2.h'" in caplog.text
@@ -38,6 +38,8 @@ from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
+from functools import lru_cache
+import os
 import re
 from cxxheaderparser.simple import parse_string
 try:
@@ -58,6 +60,17 @@ class DocumentationObjectKind(Enum):
   Struct = 'struct'
   Method = 'method'
 
+@lru_cache(maxsize=None)
+def get_xml_files_in_folder(xml_root: Path) -> Dict[str, Path]:
+  '''
+  Map from file name to path of the xml files generated by doxygen.
+  Listing the folder once is much cheaper than checking whether a file exists for every class of every header.
+  '''
+  if not xml_root.is_dir():
+    return {}
+  with os.scandir(xml_root) as it:
+    return {entry.name: Path(entry.path) for entry in it if entry.name.endswith('.xml')}
+
 class DocumentationData(object):
 
   @staticmethod
@@ -66,17 +79,14 @@ class DocumentationData(object):
       return None
 
     xml_root = GeneratorConfig.xml_doc_path
-    if xml_root is None or not xml_root.exists():
+    if xml_root is None:
       return None
-    p = None
     if kind == DocumentationObjectKind.Class:
-      p = xml_root / f'class{name}.xml'
+      file_name = f'class{name}.xml'
     else:
       assert False, 'Seeking documentation for type other than class not handled for now'
 
-    if not p.exists():
-      return None
-    return p
+    return get_xml_files_in_folder(xml_root).get(file_name)
 
 
 def to_cstring(s: str) -> str:
@@ -86,13 +96,8 @@ def to_cstring(s: str) -> str:
 
   # On Windows, strings have a maximum length.
   per_string_limit = 8192
-  current_char = 0
-  result = ''
-  while current_char < len(s):
-    result += f'''R"doc({s[current_char: min((current_char + per_string_limit), len(s))]})doc"
-  '''
-    current_char += per_string_limit
-  return result
+  return ''.join([f'''R"doc({s[current_char: min((current_char + per_string_limit), len(s))]})doc"
+  ''' for current_char in range(0, len(s), per_string_limit)])
 
 
 @dataclass
@@ -127,17 +132,14 @@ class EnumDocumentation(object):
   value_documentation: Dict[str, str]
 
   def get_overall_doc(self) -> str:
-    full_doc = ''
-    full_doc += self.general_documentation.strip('\n')
-    full_doc += '\n\nValues: \n\n'
+    doc_parts = [self.general_documentation.strip('\n'), '\n\nValues: \n\n']
     for k,v in self.value_documentation.items():
-      full_doc += '* '
-      full_doc += '**' + k + '**'
+      doc_parts.append('* **' + k + '**')
       if len(v.strip('\n').strip()) > 0:
-        full_doc += ': ' + v.strip('\n')
-      full_doc += '\n\n'
+        doc_parts.append(': ' + v.strip('\n'))
+      doc_parts.append('\n\n')
 
-    return to_cstring(full_doc)
+    return to_cstring(''.join(doc_parts))
 
   def get_value_doc(self, k: str) -> Optional[str]:
     return to_cstring(self.value_documentation.get(k) or '')
@@ -413,14 +415,15 @@ class DocumentationHolder(object):
     param_str = '\n'.join(param_strs)
 
     if len(output_param_names) > 0:
-      return_str = ':return: A tuple containing:\n' # TODO: if we only return a single element, we should modify this
+      return_parts = [':return: A tuple containing:\n'] # TODO: if we only return a single element, we should modify this
       if signature.ret != 'void' and signature.ret is not None:
-        return_str += f'\n\t * {cpp_return_str}'
+        return_parts.append(f'\n\t * {cpp_return_str}')
       for param_name in output_param_names:
         if param_name in params_dict:
-          return_str += f'\n\t * {escape_for_rst(param_name)}: {params_dict[param_name]}'
+          return_parts.append(f'\n\t * {escape_for_rst(param_name)}: {params_dict[param_name]}')
         else:
-          return_str += f'\n\t * {escape_for_rst(param_name)}'
+          return_parts.append(f'\n\t * {escape_for_rst(param_name)}')
+      return_str = ''.join(return_parts)
     else:
       return_str = f':return: {cpp_return_str}' if len(cpp_return_str) > 0 else ''
 
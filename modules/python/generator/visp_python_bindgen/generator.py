@@ -33,7 +33,7 @@
 #
 #############################################################################
 
-from typing import List
+from typing import List, Optional, Dict
 import sys
 from pathlib import Path
 from multiprocessing import Pool
@@ -44,7 +44,16 @@ from cxxheaderparser.errors import CxxParseError
 
 from visp_python_bindgen.header import *
 from visp_python_bindgen.submodule import *
-from visp_python_bindgen.generator_config import GeneratorConfig
+from visp_python_bindgen.generator_config import GeneratorConfig, PreprocessorConfig
+
+def init_preprocessing_worker(pcpp_config: PreprocessorConfig, xml_doc_path: Optional[Path]) -> None:
+  '''
+  Initialize a preprocessing subprocess.
+  When subprocesses are spawned rather than forked (e.g., on Mac), the generator configuration
+  filled from the main configuration file is not inherited and should be set again.
+  '''
+  GeneratorConfig.pcpp_config = pcpp_config
+  GeneratorConfig.xml_doc_path = xml_doc_path
 
 def header_preprocess(header: HeaderFile):
   '''
@@ -97,24 +106,28 @@ def generate_module(generate_path: Path, config_path: Path) -> None:
   for submodule in submodules:
     all_headers.extend(submodule.headers)
 
+  # The preprocessor arguments are the same for all headers: log them once
+  clang_path = GeneratorConfig.get_clang_preprocessor()
+  if clang_path is not None:
+    preprocessor_args = [clang_path] + GeneratorConfig.pcpp_config.to_clang_args_list()
+  else:
+    preprocessor_args = ['pcpp'] + GeneratorConfig.pcpp_config.to_pcpp_args_list()
+  preprocessor_args_str = ", ".join(preprocessor_args)
+  logging.info(f'Preprocessor arguments:\n{preprocessor_args_str}')
+
   from tqdm import tqdm
   # Parallel processing of headers to speedup this step
-  # This parallel implementation is disabled,
-  # since the behaviour on Mac is different and leads to preprocessing not finding vpConfig.h and others
-  # Reverting to a single process version fixes the issue
-
-  # with Pool() as pool:
-  #   new_all_headers = []
-  #   for result in list(tqdm(pool.imap(header_preprocess, all_headers), total=len(all_headers), file=sys.stderr)):
-  #     if result is None:
-  #       raise RuntimeError('There was an exception when processing headers: You should either ignore the faulty header/class, or fix the generator code!')
-  #     new_all_headers.append(result)
-
-  new_all_headers = []
-  for result in list(tqdm(map(header_preprocess, all_headers), total=len(all_headers), file=sys.stderr, unit="hdr")):
-    if result is None:
-      raise RuntimeError('There was an exception when processing headers: You should either ignore the faulty header/class, or fix the generator code!')
-    new_all_headers.append(result)
+  # The generator configuration is explicitly passed to the subprocesses:
+  # it is not inherited when they are spawned (e.g., on Mac), which would lead to preprocessing not finding vpConfig.h and others
+  # Headers are collected as soon as they are done so that a slow header does not hold back the others
+  preprocessed_headers: List[HeaderFile] = []
+  with Pool(initializer=init_preprocessing_worker, initargs=(GeneratorConfig.pcpp_config, GeneratorConfig.xml_doc_path)) as pool:
+    for result in tqdm(pool.imap_unordered(header_preprocess, all_headers), total=len(all_headers), file=sys.stderr, unit="hdr"):
+      if result is None:
+        raise RuntimeError('There was an exception when processing headers: You should either ignore the faulty header/class, or fix the generator code!')
+      preprocessed_headers.append(result)
+  new_all_headers = restore_preprocessed_headers(all_headers, preprocessed_headers)
+  HeaderFile.prune_cache(new_all_headers)
 
   # Sort headers according to the dependencies. This is done across all modules.
   # TODO: sort module generation order. For now this works but it's fairly brittle
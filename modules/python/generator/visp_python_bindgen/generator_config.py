@@ -33,8 +33,11 @@
 #
 #############################################################################
 import logging
+from functools import lru_cache
 from typing import Dict, Final, List, Optional
 import re
+import os
+import shutil
 from pathlib import Path
 from dataclasses import dataclass
 import json
@@ -76,6 +79,18 @@ class PreprocessorConfig(object):
       args.extend(['--line-directive', ''])
     return args
 
+  def to_clang_args_list(self) -> List[str]:
+    '''
+    Arguments for clang's preprocessor that match the pcpp configuration, apart from never defined macros and passthrough includes,
+    which clang does not support and are handled when writing its input.
+    '''
+    args = ['-x', 'c++', '-E', '-P', '-w']
+    for k,v in self.defines.items():
+      args.append(f'-D{k}={v}' if v is not None else f'-D{k}')
+    for v in self.include_directories:
+      args += ['-I', v]
+    return args
+
 '''
 Regular expressions that should match with types that are considered as immutable on the Python side
 This only encompasses raw types
@@ -140,6 +155,21 @@ class GeneratorConfig(object):
 
   module_data: List[ModuleInputData] = []
 
+  @staticmethod
+  @lru_cache(maxsize=None)
+  def get_clang_preprocessor() -> Optional[str]:
+    '''
+    Path to the clang executable used to preprocess headers, if clang is selected with VISP_BINDGEN_PREPROCESSOR=clang and is available.
+    If None, headers are preprocessed with pcpp.
+    Computed once per process, as it is needed for every header.
+    '''
+    if os.environ.get('VISP_BINDGEN_PREPROCESSOR', 'pcpp') != 'clang':
+      return None
+    clang_path = shutil.which('clang++')
+    if clang_path is None:
+      logging.warning('VISP_BINDGEN_PREPROCESSOR is set to clang, but clang++ was not found: falling back to pcpp')
+    return clang_path
+
   @staticmethod
   def _matches_regex_in_list(s: str, regexes: List[str]) -> bool:
     return any(map(lambda regex: re.match(regex, s) is not None, regexes))
@@ -37,12 +37,17 @@
 from typing import List, Optional, Dict
 from pathlib import Path
 from dataclasses import dataclass
-from collections import OrderedDict
+from functools import lru_cache
 import logging
+import hashlib
+import os
+import pickle
+import tempfile
+import subprocess
+import importlib.metadata
 
-import pcpp
 from cxxheaderparser import types
-from cxxheaderparser.simple import parse_string, ParsedData, NamespaceScope, ClassScope
+from cxxheaderparser.simple import ParsedData, NamespaceScope, ClassScope
 
 from visp_python_bindgen.utils import *
 from visp_python_bindgen.methods import *
@@ -56,7 +61,45 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
   from submodule import Submodule
 
+@lru_cache(maxsize=None)
+def get_package_version(package: str) -> str:
+  '''
+  Installed version of a python package, read from its metadata so that the package itself does not have to be imported.
+  '''
+  return importlib.metadata.version(package)
+
+@lru_cache(maxsize=None)
+def get_clang_forced_includes_macros(clang_path: str) -> str:
+  '''
+  Definitions of the macros set by the forced includes (vpConfig.h, etc.), as evaluated by clang.
+  Computed once per process: headers can then be preprocessed without expanding the forced includes and the standard headers they include.
+  The macros that clang predefines (__cplusplus, __unix__, etc.) are left out, as pcpp does not define them when preprocessing a header.
+  '''
+  clang_args = [clang_path] + GeneratorConfig.pcpp_config.to_clang_args_list() + ['-dM', '-']
+  predefined = subprocess.run(clang_args, input='', capture_output=True, text=True, check=True).stdout
+  predefined_names = set(re.findall(r'^#define\s+(\w+)', predefined, flags=re.M))
+
+  source = ''.join([f'#if __has_include(<{include}>)\n#include <{include}>\n#endif\n' for include in HeaderFile.FORCED_INCLUDES])
+  result = subprocess.run(clang_args, input=source, capture_output=True, text=True, encoding='utf-8')
+  if result.returncode != 0:
+    raise RuntimeError(f'clang failed to preprocess the forced includes {HeaderFile.FORCED_INCLUDES}:\n{result.stderr}')
+  macros = []
+  for line in result.stdout.splitlines(keepends=True):
+    matches = re.match(r'#define\s+(\w+)', line)
+    if matches is not None and matches.group(1) not in predefined_names:
+      macros.append(line)
+  return ''.join(macros)
+
 class HeaderFile():
+  # Includes that should be appended at the start of every file
+  FORCED_INCLUDES = [
+    'visp3/core/vpConfig.h', # Always include vpConfig: ensure that VISP macros are correctly defined
+    'opencv2/opencv_modules.hpp'
+  ]
+  # Version of the content of the preprocessing cache: bump it whenever the result of run_preprocessor
+  # (e.g., its fixups of the preprocessor output) or of the parsing changes for the same inputs
+  CACHE_VERSION = '2'
+
   def __init__(self, path: Path, submodule: 'Submodule'):
     self.path = path
     self.submodule = submodule
@@ -68,6 +111,7 @@ class HeaderFile():
     self.documentation_holder_path: Path = None
     self.documentation_holder = None
     self.environment: HeaderEnvironment = None
+    self.cache_path: Optional[Path] = None
 
   def __getstate__(self):
     return self.__dict__
@@ -106,19 +150,36 @@ class HeaderFile():
     Preprocess the header to obtain the abstract representation of the cpp classes available.
     Additionally get the path to the xml documentation file generated by doxygen
     '''
-    from cxxheaderparser.options import ParserOptions
-    self.preprocessed_header_str = self.run_preprocessor() # Run preprocessor, get only code that can be compiled with current visp
-
-    self.header_repr: ParsedData = parse_string(self.preprocessed_header_str, options=ParserOptions(verbose=False, convert_void_to_zero_params=True)) # Get the cxxheaderparser representation of the header
+    cache_path = self.submodule.submodule_file_path.parent / 'tmp' / f'{self._cache_key()}.pkl'
+    self.cache_path = cache_path
+    cache_hit = False
+    if cache_path.exists():
+      logging.info(f'Loading preprocessed header {self.path.name} from cache {cache_path.name}')
+      try:
+        with open(cache_path, 'rb') as cache_file:
+          self.preprocessed_header_str, self.header_repr = pickle.load(cache_file)
+        cache_hit = True
+      except (EOFError, pickle.UnpicklingError):
+        logging.warning(f'Cache file {cache_path.name} for header {self.path.name} is corrupted: preprocessing again')
+    if not cache_hit:
+      from cxxheaderparser.options import ParserOptions
+      from cxxheaderparser.simple import parse_string
+      self.preprocessed_header_str = self.run_preprocessor() # Run preprocessor, get only code that can be compiled with current visp
+      self.header_repr: ParsedData = parse_string(self.preprocessed_header_str, options=ParserOptions(verbose=False, convert_void_to_zero_params=True)) # Get the cxxheaderparser representation of the header
+      cache_path.parent.mkdir(exist_ok=True)
+      # Write to a temporary file first so that an interrupted run or a concurrent writer never leaves a truncated cache file
+      with tempfile.NamedTemporaryFile('wb', dir=cache_path.parent, suffix='.pkl.tmp', delete=False) as cache_file:
+        pickle.dump((self.preprocessed_header_str, self.header_repr), cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+      os.replace(cache_file.name, cache_path)
 
     # Get dependencies of this header. This is important for the code generation order
     for cls in self.header_repr.namespace.classes:
-      name_cpp_no_template = '::'.join([seg.name for seg in cls.class_decl.typename.segments])
+      name_cpp_no_template = get_name(cls.class_decl.typename)
       self.contains.append(name_cpp_no_template)
 
       # Add parent classes as dependencies
       for base_class in cls.class_decl.bases:
-        base_class_str_no_template = '::'.join([segment.name for segment in base_class.typename.segments])
+        base_class_str_no_template = get_name(base_class.typename)
         if base_class_str_no_template.startswith('vp'):
             self.depends.append(base_class_str_no_template)
 
@@ -126,32 +187,84 @@ class HeaderFile():
       if self.documentation_holder_path is None:
         self.documentation_holder_path = DocumentationData.get_xml_path_if_exists(name_cpp_no_template, DocumentationObjectKind.Class)
 
+  def _cache_key(self) -> str:
+    '''
+    Key identifying the result of preprocessing and parsing this header.
+    It changes whenever the header, the forced includes, the preprocessor arguments, the tool versions or the cache version change.
+    '''
+    h = hashlib.blake2b(digest_size=20)
+    h.update(HeaderFile.CACHE_VERSION.encode('utf-8'))
+    h.update(self.path.read_bytes())
+    for include in HeaderFile.FORCED_INCLUDES:
+      for include_dir in GeneratorConfig.pcpp_config.include_directories:
+        include_path = Path(include_dir) / include
+        if include_path.exists():
+          h.update(include_path.read_bytes())
+          break
+    clang_path = GeneratorConfig.get_clang_preprocessor()
+    if clang_path is not None:
+      h.update(clang_path.encode('utf-8'))
+      h.update(repr(GeneratorConfig.pcpp_config.to_clang_args_list()).encode('utf-8'))
+      h.update(repr(GeneratorConfig.pcpp_config.never_defined).encode('utf-8'))
+    else:
+      h.update(repr(GeneratorConfig.pcpp_config.to_pcpp_args_list()).encode('utf-8'))
+      h.update(get_package_version('pcpp').encode('utf-8'))
+    h.update(get_package_version('cxxheaderparser').encode('utf-8'))
+    return h.hexdigest()
+
+  @staticmethod
+  def prune_cache(headers: List['HeaderFile']) -> None:
+    '''
+    Remove the preprocessing cache entries that were not used by the given headers, once they have all been preprocessed.
+    They were written for previous versions of the headers, of the configuration or of the generator, and would otherwise accumulate.
+    '''
+    used_paths = set(header.cache_path for header in headers if header.cache_path is not None)
+    for cache_dir in set(path.parent for path in used_paths):
+      for path in list(cache_dir.glob('*.pkl')) + list(cache_dir.glob('*.pkl.tmp')):
+        if path not in used_paths:
+          logging.info(f'Removing unused preprocessing cache entry {path.name}')
+          path.unlink(missing_ok=True)
+
   def run_preprocessor(self):
     logging.info(f'Preprocessing header {self.path.name}')
+    clang_path = GeneratorConfig.get_clang_preprocessor()
+    if clang_path is not None:
+      preprocessor_output = self.run_clang_preprocessor(clang_path)
+    else:
+      preprocessor_output = self.run_pcpp_preprocessor()
+
+    # Remove all #defines that could have been left by the preprocessor
+    preprocessed_header_content = re.sub(r'^#define.*\n?', '', preprocessor_output, flags=re.M)
+    # Further refine header content: fix some simple parsing bugs
+    preprocessed_header_content = preprocessed_header_content.replace('#include<', '#include <') # Bug in cpp header parser
+    preprocessed_header_content = preprocessed_header_content.replace('inline friend', 'friend inline') # Bug in cpp header parser
+
+    return preprocessed_header_content
+
+  def read_header_without_includes(self, include_regex: str) -> List[str]:
+    '''
+    Read the lines of the header, removing those that are includes matching include_regex
+    '''
+    header_lines = []
+    with open(self.path.absolute(), 'r', encoding='utf-8') as input_header_file:
+      for line in input_header_file.readlines():
+        matches = re.search(include_regex, line)
+        if matches is None: # Include line if its not an include
+          header_lines.append(line)
+    return header_lines
+
+  def run_pcpp_preprocessor(self) -> str:
     tmp_dir = self.submodule.submodule_file_path.parent / "tmp"
     tmp_dir.mkdir(exist_ok=True)
     tmp_file_path = tmp_dir / (self.path.name + '.in')
     preprocessor_output_path = tmp_dir / (self.path.name)
     tmp_file_content = []
 
-    # Includes that should be appended at the start of every file
-    forced_includes = [
-      'visp3/core/vpConfig.h', # Always include vpConfig: ensure that VISP macros are correctly defined
-      'opencv2/opencv_modules.hpp'
-    ]
-    for include in forced_includes:
+    for include in HeaderFile.FORCED_INCLUDES:
       tmp_file_content.append(f'#include <{include}>\n')
 
     # Remove all includes: we only include configuration headers, defined above
-    with open(self.path.absolute(), 'r', encoding='utf-8') as input_header_file:
-      include_regex = '#include\s*<(.*)>'
-      for line in input_header_file.readlines():
-        matches = re.search(include_regex, line)
-        if matches is None: # Include line if its not an include
-          tmp_file_content.append(line)
-        # else:
-          # if 'visp3' in matches.group() or 'opencv' in matches.group():
-          #   tmp_file_content.append(line)
+    tmp_file_content.extend(self.read_header_without_includes('#include\s*<(.*)>'))
 
     with open(tmp_file_path.absolute(), 'w', encoding='utf-8') as tmp_file:
       tmp_file.write(''.join(tmp_file_content))
@@ -160,24 +273,30 @@ class HeaderFile():
 
     argv = [''] + GeneratorConfig.pcpp_config.to_pcpp_args_list()
     argv += ['-o', f'{preprocessor_output_path}', str(tmp_file_path.absolute())]
-    argv_str = ", ".join(argv)
-    logging.info(f'Preprocessor arguments:\n{argv_str}')
 
+    import pcpp # Only needed on cache misses, and slow to import
     pcpp.CmdPreprocessor(argv)
-    preprocessed_header_content = None
 
-    # Remove all #defines that could have been left by the preprocessor
     with open(preprocessor_output_path, 'r', encoding='utf-8') as header_file:
-      preprocessed_header_lines = []
-      for line in header_file.readlines():
-        if not line.startswith('#define'):
-          preprocessed_header_lines.append(line)
-      preprocessed_header_content = ''.join(preprocessed_header_lines)
-      # Further refine header content: fix some simple parsing bugs
-      preprocessed_header_content = preprocessed_header_content.replace('#include<', '#include <') # Bug in cpp header parser
-      preprocessed_header_content = preprocessed_header_content.replace('inline friend', 'friend inline') # Bug in cpp header parser
+      return header_file.read()
 
-    return preprocessed_header_content
+  def run_clang_preprocessor(self, clang_path: str) -> str:
+    '''
+    Preprocess the header with clang, which is much faster than pcpp.
+    Clang cannot pass through includes: they are all removed and the macros of the forced includes are defined instead.
+    '''
+    source_lines = [get_clang_forced_includes_macros(clang_path)]
+    for macro in GeneratorConfig.pcpp_config.never_defined:
+      source_lines.append(f'#undef {macro}\n')
+    source_lines.extend(self.read_header_without_includes('#include\s*[<"](.*)[>"]'))
+
+    # Do not predefine any macro, as pcpp
+    argv = [clang_path] + GeneratorConfig.pcpp_config.to_clang_args_list() + ['-undef', '-U__cplusplus', '-']
+
+    result = subprocess.run(argv, input=''.join(source_lines), capture_output=True, text=True, encoding='utf-8')
+    if result.returncode != 0:
+      raise RuntimeError(f'clang failed to preprocess header {self.path}:\n{result.stderr}')
+    return result.stdout
 
   def generate_binding_code(self, bindings_container: BindingsContainer) -> None:
     assert self.header_repr is not None, 'The header was not preprocessed before calling the generation step!'
@@ -253,7 +372,7 @@ class HeaderFile():
     If it is templated, the mapping (template argument types => Python class name) must be provided in the JSON config file
     Subclasses are also generated
     '''
-    def generate_class_with_potiental_specialization(name_python: str, owner_specs: 'OrderedDict[str, str]', cls_config: Dict, header_env: HeaderEnvironment) -> None:
+    def generate_class_with_potiental_specialization(name_python: str, owner_specs: Dict[str, str], cls_config: Dict, header_env: HeaderEnvironment) -> None:
       '''
       Generate the bindings of a single class, handling a potential template specialization.
       '''
@@ -276,8 +395,8 @@ class HeaderFile():
         if self.documentation_holder is not None:
           method_name = get_name(method.name)
           method_doc_signature = MethodDocSignature(method_name,
-                                                    get_type(method.return_type, {}, header_env.mapping) or '', # Don't use specializations so that we can match with doc
-                                                    [get_type(param.type, {}, header_env.mapping) for param in method.parameters],
+                                                    header_env.get_type(method.return_type, {}) or '', # Don't use specializations so that we can match with doc
+                                                    [header_env.get_type(param.type, {}) for param in method.parameters],
                                                     method.const, method.static)
           method_doc = self.documentation_holder.get_documentation_for_method(name_cpp_no_template, method_doc_signature, {}, owner_specs, param_names, [])
           if method_doc is None:
@@ -299,8 +418,7 @@ class HeaderFile():
       template_decl: Optional[types.TemplateDecl] = cls.class_decl.template
       template_strs = None
       if template_decl is not None:
-        template_strs = []
-        template_strs = map(lambda t: owner_specs[t.name], template_decl.params)
+        template_strs = [owner_specs[t.name] for t in template_decl.params]
         template_str = f'<{", ".join(template_strs)}>'
         name_cpp += template_str
 
@@ -312,8 +430,8 @@ class HeaderFile():
 
 
       # Reference public base classes when creating pybind class binding
-      base_class_strs = list(map(lambda base_class: get_typename(base_class.typename, owner_specs, header_env.mapping),
-                            filter(lambda b: b.access == 'public', cls.class_decl.bases)))
+      base_class_strs = [get_typename(base_class.typename, owner_specs, header_env.mapping)
+                         for base_class in cls.class_decl.bases if base_class.access == 'public']
 
       # Add trampoline class if defined
       # Trampoline classes allow classes defined in Python to override virtual methods declared in C++
@@ -331,19 +449,6 @@ class HeaderFile():
 
       class_decl = f'\tpy::class_ {python_ident} = py::class_<{py_class_template_str}>({", ".join(cls_argument_strs)});'
 
-      # Definitions
-      # Skip constructors for classes that have pure virtual methods since they cannot be instantiated
-      contains_pure_virtual_methods = False
-      for method in cls.methods:
-        if method.pure_virtual:
-          contains_pure_virtual_methods = True
-          break
-
-      # User marked this class as virtual.
-      # This is required if no virtual method is declared in this class,
-      #  but it does not implement pure virtual methods of a base class
-      contains_pure_virtual_methods = contains_pure_virtual_methods or cls_config['is_virtual']
-
       # Find bindable methods
       generated_methods: List[MethodData] = []
       bindable_methods_and_config, rejected_methods = get_bindable_methods_with_config(self.submodule, cls.methods,
@@ -362,14 +467,13 @@ class HeaderFile():
       constructors, non_constructors = split_methods_with_config(bindable_methods_and_config, lambda m: m.constructor)
 
       # Split between "normal" methods and operators, which require a specific definition
-      cpp_operator_names = cpp_operator_list()
-      operators, basic_methods = split_methods_with_config(non_constructors, lambda m: get_name(m.name) in cpp_operator_names)
+      operators, basic_methods = split_methods_with_config(non_constructors, lambda m: get_name(m.name) in CPP_OPERATOR_NAMES)
 
       # Constructors definitions
       if not contains_pure_virtual_methods or trampoline_name is not None:
         for method, method_config in constructors:
           method_name = get_name(method.name)
-          params_strs = [get_type(param.type, owner_specs, header_env.mapping) for param in method.parameters]
+          params_strs = [header_env.get_type(param.type, owner_specs) for param in method.parameters]
           py_arg_strs = get_py_args(method.parameters, owner_specs, header_env.mapping)
 
           param_names = [param.name or 'arg' + str(i) for i, param in enumerate(method.parameters)]
@@ -386,8 +490,8 @@ class HeaderFile():
       for method, method_config in operators:
         method_name = get_name(method.name)
         method_is_const = method.const
-        params_strs = [get_type(param.type, owner_specs, header_env.mapping) for param in method.parameters]
-        return_type_str = get_type(method.return_type, owner_specs, header_env.mapping)
+        params_strs = [header_env.get_type(param.type, owner_specs) for param in method.parameters]
+        return_type_str = header_env.get_type(method.return_type, owner_specs)
         py_args = get_py_args(method.parameters, owner_specs, header_env.mapping)
         py_args = py_args + ['py::is_operator()']
         param_names = [param.name or 'arg' + str(i) for i, param in enumerate(method.parameters)]
@@ -401,40 +505,32 @@ class HeaderFile():
         #   self.submodule.report.add_non_generated_method(rejection)
         #   continue
         if len(params_strs) < 1: # Unary ops
-          for cpp_op, python_op_name in supported_const_return_unary_op_map().items():
-            if method_name == f'operator{cpp_op}':
-              operator_str = lambda_const_return_unary_op(python_ident, python_op_name, cpp_op,
-                                                         method_is_const, name_cpp,
-                                                         return_type_str, py_args)
-              add_to_method_dict(f'__{python_op_name}__', MethodBinding(operator_str, is_static=False, is_lambda=True,
-                                                       is_operator=True, is_constructor=False))
-              break
-        elif len(params_strs) == 1: # e.g., self + other
-          for cpp_op, python_op_name in supported_const_return_binary_op_map().items():
-            if method_name == f'operator{cpp_op}':
-              operator_str = lambda_const_return_binary_op(python_ident, python_op_name, cpp_op,
-                                                          method_is_const, name_cpp, params_strs[0],
-                                                          return_type_str, py_args)
-              add_to_method_dict(f'__{python_op_name}__', MethodBinding(operator_str, is_static=False, is_lambda=True,
-                                                        is_operator=True, is_constructor=False))
-              break
-          for cpp_op, python_op_name in supported_in_place_binary_op_map().items():
-            if method_name == f'operator{cpp_op}':
-              operator_str = lambda_in_place_binary_op(python_ident, python_op_name, cpp_op,
-                                                      method_is_const, name_cpp, params_strs[0],
-                                                      return_type_str, py_args)
-              add_to_method_dict(f'__{python_op_name}__', MethodBinding(operator_str, is_static=False, is_lambda=True,
-                                                        is_operator=True, is_constructor=False))
-              break
+          operator = UNARY_OPERATORS.get(method_name)
+          if operator is not None:
+            cpp_op, python_op_name = operator
+            operator_str = lambda_const_return_unary_op(python_ident, python_op_name, cpp_op,
+                                                       method_is_const, name_cpp,
+                                                       return_type_str, py_args)
+            add_to_method_dict(f'__{python_op_name}__', MethodBinding(operator_str, is_static=False, is_lambda=True,
+                                                     is_operator=True, is_constructor=False))
+        elif len(params_strs) == 1: # e.g., self + other, self += other
+          operator = BINARY_OPERATORS.get(method_name)
+          if operator is not None:
+            cpp_op, python_op_name, lambda_binary_op = operator
+            operator_str = lambda_binary_op(python_ident, python_op_name, cpp_op,
+                                            method_is_const, name_cpp, params_strs[0],
+                                            return_type_str, py_args)
+            add_to_method_dict(f'__{python_op_name}__', MethodBinding(operator_str, is_static=False, is_lambda=True,
+                                                      is_operator=True, is_constructor=False))
         else: # N-ary operators
-          for cpp_op, python_op_name in supported_nary_op_map().items():
-            if method_name == f'operator{cpp_op}':
-              operator_str = lambda_nary_op(python_ident, python_op_name, cpp_op,
-                                                    method_is_const, name_cpp, params_strs,
-                                                    return_type_str, py_args)
-              add_to_method_dict(f'__{python_op_name}__', MethodBinding(operator_str, is_static=False, is_lambda=True,
-                                                        is_operator=True, is_constructor=False))
-              break
+          operator = NARY_OPERATORS.get(method_name)
+          if operator is not None:
+            cpp_op, python_op_name = operator
+            operator_str = lambda_nary_op(python_ident, python_op_name, cpp_op,
+                                          method_is_const, name_cpp, params_strs,
+                                          return_type_str, py_args)
+            add_to_method_dict(f'__{python_op_name}__', MethodBinding(operator_str, is_static=False, is_lambda=True,
+                                                      is_operator=True, is_constructor=False))
 
       # Define classical methods
       class_def_names = BoundObjectNames(python_ident, name_python, name_cpp_no_template, name_cpp)
@@ -446,7 +542,7 @@ class HeaderFile():
           for method_spec in specializations:
             new_specs = owner_specs.copy()
             assert len(method_template_names) == len(method_spec)
-            method_spec_dict = OrderedDict(k for k in zip(method_template_names, method_spec))
+            method_spec_dict = dict(zip(method_template_names, method_spec))
             new_specs.update(method_spec_dict)
             method_str, method_data = define_method(method, method_config, True,
                                                     new_specs, self, header_env, class_def_names)
@@ -473,7 +569,7 @@ class HeaderFile():
       # from visp.core import B
       # b = B()
       # b.foo(0) # no overload known with int
-      base_bindings = list(filter(lambda b: b is not None, map(lambda s: bindings_container.find_bindings(s), base_class_strs)))
+      base_bindings = [b for b in (bindings_container.find_bindings(s) for s in base_class_strs) if b is not None]
 
       # assert not any(map(lambda b: b is None, base_bindings)), f'Could not retrieve the bindings for a base class of {name_cpp}'
       for base_binding_container in base_bindings:
@@ -522,9 +618,7 @@ class HeaderFile():
       use_publicist = cls_config['use_publicist']
       publicist_name = f'Publicist{name_python}'
       publicist_str = None
-      if use_publicist:
-        publicist_str = f'class {publicist_name}: public {name_cpp} {{\n'
-        publicist_str += 'public:\n'
+      publicist_lines = [f'class {publicist_name}: public {name_cpp} {{\n', 'public:\n']
 
 
       field_dict = {}
@@ -536,7 +630,7 @@ class HeaderFile():
           if is_unsupported_argument_type(field.type):
             continue
 
-          field_type = get_type(field.type, owner_specs, header_env.mapping)
+          field_type = header_env.get_type(field.type, owner_specs)
           field_name_python = field.name
           prefix_member = 'm_'
           if field_name_python.startswith(prefix_member):
@@ -552,13 +646,14 @@ class HeaderFile():
           field_exposing_class = name_cpp if field.access == 'public' else publicist_name
 
           if field.access == 'protected':
-            publicist_str += f'\tusing {name_cpp}::{field.name};\n'
+            publicist_lines.append(f'\tusing {name_cpp}::{field.name};\n')
 
           field_str = f'{python_ident}.{def_str}("{field_name_python}", &{field_exposing_class}::{field.name});'
           field_dict[field_name_python] = field_str
 
       if use_publicist:
-        publicist_str += '};'
+        publicist_lines.append('};')
+        publicist_str = ''.join(publicist_lines)
       classs_binding_defs = ClassBindingDefinitions(field_dict, methods_dict, publicist_str)
       bindings_container.add_bindings(SingleObjectBindings(class_def_names, class_decl, classs_binding_defs, GenerationObjectType.Class))
 
@@ -581,13 +676,20 @@ class HeaderFile():
 
     # Warning for potential double frees
     acknowledged_pointer_fields = cls_config.get('acknowledge_pointer_or_ref_fields') or []
-    refs_or_ptr_fields = list(map(lambda field: get_type(field.type, {}, header_env_base.mapping), filter(lambda field: isinstance(field.type, types.Pointer) or isinstance(field.type, types.Reference),
-                                    cls.fields)))
+    refs_or_ptr_fields = [get_type(field.type, {}, header_env_base.mapping) for field in cls.fields
+                          if isinstance(field.type, (types.Pointer, types.Reference))]
 
     # If some pointer or refs are not acknowledged as existing by user, emit a warning
     if len(set(refs_or_ptr_fields).difference(set(acknowledged_pointer_fields))) > 0:
       self.submodule.report.add_pointer_or_ref_holder(name_cpp_no_template, refs_or_ptr_fields)
 
+    # Skip constructors for classes that have pure virtual methods since they cannot be instantiated
+    # This does not depend on the template specialization, so it is computed once for all specializations.
+    # The user may also mark a class as virtual.
+    # This is required if no virtual method is declared in this class,
+    #  but it does not implement pure virtual methods of a base class
+    contains_pure_virtual_methods = cls_config['is_virtual'] or any(method.pure_virtual for method in cls.methods)
+
     if cls.class_decl.template is None:
       name_python = name_cpp_no_template.replace('vp', '')
       generate_class_with_potiental_specialization(name_python, {}, cls_config, header_env_base)
@@ -602,5 +704,5 @@ class HeaderFile():
           name_python = spec['python_name']
           args = spec['arguments']
           assert len(template_names) == len(args), f'Specializing {name_cpp_no_template}: Template arguments are {template_names} but found specialization {args} which has the wrong number of arguments'
-          spec_dict = OrderedDict(k for k in zip(template_names, args))
+          spec_dict = dict(zip(template_names, args))
           generate_class_with_potiental_specialization(name_python, spec_dict, cls_config, header_env_base)
@@ -33,8 +33,10 @@
 #
 #############################################################################
 
-from typing import List, Set, Dict, Union
+from typing import List, Set, Dict, Union, Tuple, Optional
 import sys
+from collections import deque
+from pathlib import Path
 
 import logging
 
@@ -57,41 +59,62 @@ def sort_headers(headers: List['HeaderFile']) -> List['HeaderFile']:
   This step is important to ensure that the code generation is performed in the correct order.
   It is not possible to declare an inheriting class to pybind without first exposing the base class.
   '''
-  def add_level(result: List['HeaderFile'], remainder: List['HeaderFile'], dependencies: Set[str]):
-    if len(remainder) == 0:
-      return
-
-    include_in_result_fn = None
-    if len(result) == 0: # First iteration, query all headers that have no dependencies
-      include_in_result_fn = lambda h: len(h.depends) == 0
-    else:
-      # Some header define multiple classes, where one may rely on another. So we filter h.depends
-      include_in_result_fn = lambda h: all(map(lambda x: x in dependencies, filter(lambda s: s not in h.contains, h.depends)))
-    new_remainder = []
-    new_dependencies = dependencies.copy()
-    for header_file in remainder:
-      has_dependency = include_in_result_fn(header_file)
-      if has_dependency:
-        new_dependencies = new_dependencies | set(header_file.contains)
-        result.append(header_file)
-      else:
-        new_remainder.append(header_file)
-    if new_remainder == remainder:
-      warning_msg = f'''
-      Warning: Could not completely solve dependencies, generating but might have some errors
-      Faulty headers: {[h.path.name for h in remainder]}'''
-      logging.warning(warning_msg)
-      print(warning_msg, file=sys.stderr)
-      result.extend(remainder)
-    else:
-      add_level(result, new_remainder, set(new_dependencies))
+  # Map each class name to the header that defines it
+  symbol_to_header: Dict[str, 'HeaderFile'] = {}
+  for header_file in headers:
+    for symbol in header_file.contains:
+      symbol_to_header[symbol] = header_file
+
+  # Some header define multiple classes, where one may rely on another: ignore dependencies on the header itself.
+  # Dependencies on classes that are not defined in any header cannot be resolved here and are ignored as well.
+  in_degree: Dict[int, int] = {}
+  dependents: Dict[int, List['HeaderFile']] = {id(h): [] for h in headers}
+  for header_file in headers:
+    header_deps = {id(symbol_to_header[d]): symbol_to_header[d] for d in header_file.depends
+                   if d in symbol_to_header and symbol_to_header[d] is not header_file}
+    in_degree[id(header_file)] = len(header_deps)
+    for dependency in header_deps.values():
+      dependents[id(dependency)].append(header_file)
+
+  ready = deque([h for h in headers if in_degree[id(h)] == 0])
   result = []
-  add_level(result, headers, set())
+  while len(ready) > 0:
+    header_file = ready.popleft()
+    result.append(header_file)
+    for dependent in dependents[id(header_file)]:
+      in_degree[id(dependent)] -= 1
+      if in_degree[id(dependent)] == 0:
+        ready.append(dependent)
+
+  if len(result) != len(headers):
+    remainder = [h for h in headers if in_degree[id(h)] > 0]
+    warning_msg = f'''
+    Warning: Could not completely solve dependencies, generating but might have some errors
+    Faulty headers: {[h.path.name for h in remainder]}'''
+    logging.warning(warning_msg)
+    print(warning_msg, file=sys.stderr)
+    result.extend(remainder)
+  return result
+
+def restore_preprocessed_headers(headers: List['HeaderFile'], preprocessed: List['HeaderFile']) -> List['HeaderFile']:
+  '''
+  Match the headers returned by the preprocessing workers, in any order, with the headers that were sent to them.
+  The workers return copies: each one was pickled along with its own copy of its submodule.
+  They are attached back to the original submodules, so that the reports filled during the code generation are the ones written to disk.
+  The result follows the order of headers, so that the generated code does not depend on scheduling.
+  '''
+  path_to_result: Dict[Path, 'HeaderFile'] = {result.path: result for result in preprocessed}
+  result = []
+  for header in headers:
+    preprocessed_header = path_to_result[header.path]
+    preprocessed_header.submodule = header.submodule
+    result.append(preprocessed_header)
   return result
 
 class HeaderEnvironment():
   def __init__(self, data: Optional[ParsedData]):
     self.data = data
+    self.type_cache: Dict[Tuple[int, Tuple[Tuple[str, str], ...]], Optional[str]] = {}
     if data is not None:
       self.mapping: Dict[str, str] = self.build_naive_mapping(data.namespace, {})
       # Step 2: resolve enumeration names that are possibly hidden behind typedefs
@@ -101,83 +124,63 @@ class HeaderEnvironment():
         for value in enum_repr.values:
           self.mapping[value.name] = enum_repr.name + '::' + value.name
 
+  def get_type(self, param: Union[types.FunctionType, types.DecoratedType, types.Value], owner_specs: Dict[str, str]) -> Optional[str]:
+    '''
+    Get the type of a parameter (see get_type), resolved with this environment's mapping.
+    The result is memoized per AST node and template specialization, as the same parameters are resolved multiple times when generating a method.
+    '''
+    key = (id(param), tuple(owner_specs.items()))
+    if key not in self.type_cache:
+      self.type_cache[key] = get_type(param, owner_specs, self.mapping)
+    return self.type_cache[key]
+
   def update_naive_mapping_with_template_instanciation(self, templated_class_name_raw, templated_class_name_full, owner_specs):
+    self.type_cache.clear()
     self.mapping.clear()
     for k, v in owner_specs.items():
       self.mapping[k] = v
-
-    def update(data, mapping, scope):
-      current_mapping = mapping.copy()
-      previous_mapping = None
-
-      while current_mapping != previous_mapping:
-        previous_mapping = current_mapping.copy()
-
-        for alias in data.using_alias:
-          current_mapping[alias.alias] = get_type(alias.type, {}, current_mapping)
-
-        for typedef in data.typedefs:
-          if not typedef_is_anonymous(typedef.type):
-            current_mapping[typedef.name] = get_type(typedef.type, {}, current_mapping)
-          else:
-            current_mapping[typedef.name] = scope + typedef.name
-        for enum in data.enums:
-          if not name_is_anonymous(enum.typename):
-            enum_name = '::'.join([seg.name for seg in enum.typename.segments])
-            current_mapping[enum_name] = scope + enum_name
-
-        for cls in data.classes:
-          cls_name = '::'.join([seg.name for seg in cls.class_decl.typename.segments if not isinstance(seg, types.AnonymousName)])
-          if cls_name == templated_class_name_raw:
-            current_mapping[cls_name] = scope + cls_name
-            current_mapping.update(update(cls, mapping=current_mapping, scope=f'{scope}{templated_class_name_full}::'))
-          else:
-            current_mapping[cls_name] = scope + cls_name
-            current_mapping.update(update(cls, mapping=current_mapping, scope=f'{scope}{cls_name}::'))
-
-        if isinstance(data, NamespaceScope):
-          for namespace in data.namespaces:
-            current_mapping.update(update(data.namespaces[namespace], mapping=current_mapping, scope=f'{scope}{namespace}::'))
-
-      return current_mapping
-
-    self.mapping = update(self.data.namespace, self.mapping, '')
-
-
-
-
-  def build_naive_mapping(self, data: Union[NamespaceScope, ClassScope], mapping, scope: str = ''):
-    current_mapping = mapping.copy()
+    self.build_naive_mapping(self.data.namespace, self.mapping, '', templated_class_name_raw, templated_class_name_full)
+
+  def build_naive_mapping(self, data: Union[NamespaceScope, ClassScope], mapping: Dict[str, str], scope: str = '',
+                          templated_class_name_raw: Optional[str] = None, templated_class_name_full: Optional[str] = None) -> Dict[str, str]:
+    '''
+    Update mapping, in place, from partially qualified names to fully qualified names for the types defined in data and its subscopes.
+    Passes are repeated until the mapping no longer changes, as typedefs can refer to types declared after them.
+    If templated_class_name_raw is given, the scope of this class is named after templated_class_name_full.
+    '''
     previous_mapping = None
-
-    while current_mapping != previous_mapping:
-      previous_mapping = current_mapping.copy()
-
-      for alias in data.using_alias:
-        current_mapping[alias.alias] = get_type(alias.type, {}, current_mapping)
-
-      for typedef in data.typedefs:
-        if not typedef_is_anonymous(typedef.type):
-          current_mapping[typedef.name] = get_type(typedef.type, {}, current_mapping)
-        else:
-          current_mapping[typedef.name] = scope + typedef.name
-      for enum in data.enums:
-        if not name_is_anonymous(enum.typename):
-          enum_name = '::'.join([seg.name for seg in enum.typename.segments])
-          current_mapping[enum_name] = scope + enum_name
-
-      for cls in data.classes:
-        cls_name = '::'.join([seg.name for seg in cls.class_decl.typename.segments if not isinstance(seg, types.AnonymousName)])
-        current_mapping[cls_name] = scope + cls_name
-        current_mapping.update(self.build_naive_mapping(cls, mapping=current_mapping, scope=f'{scope}{cls_name}::'))
-
-      if isinstance(data, NamespaceScope):
-        for namespace in data.namespaces:
-          current_mapping.update(self.build_naive_mapping(data.namespaces[namespace], mapping=current_mapping, scope=f'{scope}{namespace}::'))
-
-    return current_mapping
+    while mapping != previous_mapping:
+      previous_mapping = mapping.copy()
+      self._update_naive_mapping(data, mapping, scope, templated_class_name_raw, templated_class_name_full)
+    return mapping
+
+  def _update_naive_mapping(self, data: Union[NamespaceScope, ClassScope], mapping: Dict[str, str], scope: str,
+                            templated_class_name_raw: Optional[str], templated_class_name_full: Optional[str]) -> None:
+    for alias in data.using_alias:
+      mapping[alias.alias] = get_type(alias.type, {}, mapping)
+
+    for typedef in data.typedefs:
+      if not typedef_is_anonymous(typedef.type):
+        mapping[typedef.name] = get_type(typedef.type, {}, mapping)
+      else:
+        mapping[typedef.name] = scope + typedef.name
+    for enum in data.enums:
+      if not name_is_anonymous(enum.typename):
+        enum_name = get_name(enum.typename)
+        mapping[enum_name] = scope + enum_name
+
+    for cls in data.classes:
+      cls_name = '::'.join([seg.name for seg in cls.class_decl.typename.segments if not isinstance(seg, types.AnonymousName)])
+      mapping[cls_name] = scope + cls_name
+      cls_scope_name = templated_class_name_full if cls_name == templated_class_name_raw else cls_name
+      self._update_naive_mapping(cls, mapping, f'{scope}{cls_scope_name}::', templated_class_name_raw, templated_class_name_full)
+
+    if isinstance(data, NamespaceScope):
+      for namespace in data.namespaces:
+        self._update_naive_mapping(data.namespaces[namespace], mapping, f'{scope}{namespace}::', templated_class_name_raw, templated_class_name_full)
 
   def update_with_dependencies(self, other_envs: List['HeaderEnvironment']) -> None:
+    self.type_cache.clear()
     for env in other_envs:
       self.mapping.update(env)
 
@@ -34,7 +34,7 @@
 #############################################################################
 
 import logging
-from typing import Any, Callable, List, Optional, Tuple, Dict
+from typing import Any, Callable, List, Optional, Set, Tuple, Dict
 from enum import Enum
 from dataclasses import dataclass
 
@@ -146,6 +146,23 @@ def lambda_nary_op(python_ident: str, python_op_name: str, cpp_op: str, method_i
 }}, {", ".join(py_args)});'''
 
 
+'''
+Operator tables, built once: map a cpp method name (e.g. "operator+") to the operator symbol, its python name
+and, for binary operators, the function that defines its binding.
+'''
+CPP_OPERATOR_NAMES: Set[str] = set(cpp_operator_list())
+UNARY_OPERATORS: Dict[str, Tuple[str, str]] = {
+  f'operator{cpp_op}': (cpp_op, python_op_name) for cpp_op, python_op_name in supported_const_return_unary_op_map().items()
+}
+BINARY_OPERATORS: Dict[str, Tuple[str, str, Callable]] = {
+  **{f'operator{cpp_op}': (cpp_op, python_op_name, lambda_const_return_binary_op) for cpp_op, python_op_name in supported_const_return_binary_op_map().items()},
+  **{f'operator{cpp_op}': (cpp_op, python_op_name, lambda_in_place_binary_op) for cpp_op, python_op_name in supported_in_place_binary_op_map().items()},
+}
+NARY_OPERATORS: Dict[str, Tuple[str, str]] = {
+  f'operator{cpp_op}': (cpp_op, python_op_name) for cpp_op, python_op_name in supported_nary_op_map().items()
+}
+
+
 def find_and_define_repr_str(cls: ClassScope, cls_name: str, python_ident: str) -> str:
   for friend in cls.friends:
     if friend.fn is not None:
@@ -272,23 +289,23 @@ def get_py_args(parameters: List[types.Parameter], specs, env_mapping) -> List[s
   return py_args
 
 def define_method(method: types.Method, method_config: Dict, is_class_method, specs: Dict, header: 'HeaderFile', header_env: 'HeaderEnvironment', bound_object: 'BoundObjectNames'):
-  params_strs = [get_type(param.type, specs, header_env.mapping) for param in method.parameters]
+  params_strs = [header_env.get_type(param.type, specs) for param in method.parameters]
   py_arg_strs = get_py_args(method.parameters, specs, header_env.mapping)
   method_name = get_name(method.name)
   py_method_name = method_config.get('custom_name') or method_name
-  return_type = get_type(method.return_type, specs, header_env.mapping)
+  return_type = header_env.get_type(method.return_type, specs)
   param_is_function_ptr = [is_function_pointer(param.type) for param in method.parameters]
 
   method_signature = get_method_signature(method_name,
-                                          get_type(method.return_type, {}, header_env.mapping),
-                                          [get_type(param.type, {}, header_env.mapping) for param in method.parameters])
+                                          header_env.get_type(method.return_type, {}),
+                                          [header_env.get_type(param.type, {}) for param in method.parameters])
 
   # Detect input and output parameters for a method
   use_default_param_policy = method_config['use_default_param_policy']
   param_is_input, param_is_output = method_config['param_is_input'], method_config['param_is_output']
   if use_default_param_policy or param_is_input is None and param_is_output is None:
     param_is_input = [True for _ in range(len(method.parameters))]
-    param_is_output = list(map(lambda param: is_non_const_ref_to_immutable_type(param.type), method.parameters))
+    param_is_output = [is_non_const_ref_to_immutable_type(param.type) for param in method.parameters]
     if any(param_is_output): # Emit a warning when using default policy
       header.submodule.report.add_default_policy_method(bound_object.cpp_no_template_name, method, method_signature, param_is_input, param_is_output)
 
@@ -328,13 +345,13 @@ def define_method(method: types.Method, method_config: Dict, is_class_method, sp
   if header.documentation_holder is not None:
     if is_class_method:
       method_doc_signature = MethodDocSignature(method_name,
-                                                get_type(method.return_type, {}, header_env.mapping), # Don't use specializations so that we can match with doc
-                                                [get_type(param.type, {}, header_env.mapping) for param in method.parameters],
+                                                header_env.get_type(method.return_type, {}), # Don't use specializations so that we can match with doc
+                                                [header_env.get_type(param.type, {}) for param in method.parameters],
                                                 method.const, method.static)
     else:
       method_doc_signature = MethodDocSignature(method_name,
-                                                get_type(method.return_type, {}, header_env.mapping), # Don't use specializations so that we can match with doc
-                                                [get_type(param.type, {}, header_env.mapping) for param in method.parameters],
+                                                header_env.get_type(method.return_type, {}), # Don't use specializations so that we can match with doc
+                                                [header_env.get_type(param.type, {}) for param in method.parameters],
                                                 True, True)
     method_doc = header.documentation_holder.get_documentation_for_method(bound_object.cpp_no_template_name, method_doc_signature, {}, specs, input_param_names, output_param_names)
     if method_doc is None:
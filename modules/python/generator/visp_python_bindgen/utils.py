@@ -162,8 +162,13 @@ def get_name(name: types.PQName) -> str:
   '''
   Get the fully qualified name of a type.
   Template specializations will not appear!
+  The result is stored on the node, as the names of classes and methods are queried multiple times during generation.
   '''
-  return '::'.join([segment.name for segment in name.segments])
+  full_name = getattr(name, '_visp_full_name', None)
+  if full_name is None:
+    full_name = '::'.join([segment.name for segment in name.segments])
+    name._visp_full_name = full_name
+  return full_name
 
 def typedef_is_anonymous(type: types.DecoratedType) -> bool:
   if isinstance(type, types.Array):
@@ -0,0 +1,85 @@
+#############################################################################
+#
+# ViSP, open source Visual Servoing Platform software.
+# Copyright (C) 2005 - 2023 by Inria. All rights reserved.
+#
+# This software is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+# See the file LICENSE.txt at the root directory of this source
+# distribution for additional information about the GNU GPL.
+#
+# For using ViSP with software that can not be combined with the GNU
+# GPL, please contact Inria about acquiring a ViSP Professional
+# Edition License.
+#
+# See https://visp.inria.fr for more information.
+#
+# This software was developed at:
+# Inria Rennes - Bretagne Atlantique
+# Campus Universitaire de Beaulieu
+# 35042 Rennes Cedex
+# France
+#
+# If you have questions regarding the use of this file, please contact
+# Inria at visp@inria.fr
+#
+# This file is provided AS IS with NO WARRANTY OF ANY KIND, INCLUDING THE
+# WARRANTY OF DESIGN, MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+# Description:
+# ViSP Python bindings test
+#
+#############################################################################
+
+from pytest import approx
+from visp.core import ColVector, Matrix, UnscentedKalman, UKSigmaDrawerMerwe
+
+def fx(x: ColVector, dt: float) -> ColVector:
+  return ColVector([x[0] + dt * x[1], x[1]])
+
+def hx(x: ColVector) -> ColVector:
+  return ColVector([x[0]])
+
+def fx_in_place(x: ColVector, dt: float, point: ColVector) -> None:
+  point[0] = x[0] + dt * x[1]
+  point[1] = x[1]
+
+def hx_in_place(x: ColVector, meas: ColVector) -> None:
+  meas[0] = x[0]
+
+def run_filter(setup_functions) -> ColVector:
+  '''
+  Filter the noise-free positions of an object moving at constant velocity
+  '''
+  drawer = UKSigmaDrawerMerwe(2, 0.3, 2., 1.)
+  Q = Matrix([[0.01, 0.], [0., 0.01]])
+  R = Matrix([[0.25]])
+  ukf = UnscentedKalman(Q, R, drawer, fx, hx)
+  setup_functions(ukf)
+  ukf.init(ColVector([0., 0.]), Matrix([[4., 0.], [0., 1.]]))
+  for i in range(20):
+    ukf.filter(ColVector([0.5 * i]), 1.)
+  return ukf.getXest()
+
+def test_ukf_in_place_functions_write_in_filter():
+  '''
+  The vectors that the in-place functions receive are those of the filter, not copies:
+  what they write must be used by the filter, which then gives the same estimates as with the other functions
+  '''
+  expected = run_filter(lambda ukf: None)
+
+  def use_in_place_functions(ukf: UnscentedKalman) -> None:
+    ukf.setProcessInPlaceFunction(fx_in_place)
+    ukf.setMeasurementInPlaceFunction(hx_in_place)
+  x = run_filter(use_in_place_functions)
+  assert x[0] == approx(expected[0]) and x[1] == approx(expected[1])
+  assert x[1] == approx(0.5, abs=0.05)
+
+  def reset_in_place_functions(ukf: UnscentedKalman) -> None:
+    use_in_place_functions(ukf)
+    ukf.setProcessInPlaceFunction(None)
+    ukf.setMeasurementInPlaceFunction(None)
+  x = run_filter(reset_in_place_functions)
+  assert x[0] == approx(expected[0]) and x[1] == approx(expected[1])
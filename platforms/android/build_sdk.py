@@ -1,10 +1,14 @@
 #!/usr/bin/env python
 
 import os, sys
-from distutils.dir_util import copy_tree
 import argparse
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
 import glob
+import importlib.util
+import itertools
 import re
+import shlex
 import shutil
 import subprocess
 import time
@@ -20,24 +24,37 @@ class Fail(Exception):
     def __str__(self):
         return "ERROR" if self.t is None else self.t
 
-def execute(cmd, shell=False):
+def execute(cmd, shell=False, quiet=False, env=None):
+    if log.getLogger().isEnabledFor(log.INFO):
+        log.info('Executing: %s', cmd if shell else shlex.join(cmd))
     try:
-        log.debug("Executing: %s" % cmd)
-        log.info('Executing: ' + ' '.join(cmd))
-        retcode = subprocess.call(cmd, shell=shell)
-        if retcode < 0:
-            raise Fail("Child was terminated by signal: %s" % -retcode)
-        elif retcode > 0:
-            raise Fail("Child returned: %s" % retcode)
+        subprocess.run(cmd, shell=shell, check=True, stdout=subprocess.DEVNULL if quiet else None, env=env)
+    except subprocess.CalledProcessError as e:
+        if e.returncode < 0:
+            raise Fail("Child was terminated by signal: %s" % -e.returncode)
+        raise Fail("Child returned: %s" % e.returncode)
     except OSError as e:
         raise Fail("Execution failed: %d / %s" % (e.errno, e.strerror))
 
+RM_PATH = shutil.which('rm') if os.name == 'posix' else None
+
+def rm_trees(dirs):
+    # A single rm process removes large build trees faster than shutil.rmtree, which makes Python calls for every file
+    if len(dirs) == 0:
+        return
+    if RM_PATH is not None:
+        subprocess.run([RM_PATH, '-rf', '--'] + dirs, check=True)
+    else:
+        for d in dirs:
+            shutil.rmtree(d)
+
 def rm_one(d):
-    d = os.path.abspath(d)
+    if not os.path.isabs(d):
+        d = os.path.abspath(d)
     if os.path.exists(d):
         if os.path.isdir(d):
             log.info("Removing dir: %s", d)
-            shutil.rmtree(d)
+            rm_trees([d])
         elif os.path.isfile(d):
             log.info("Removing file: %s", d)
             os.remove(d)
@@ -49,17 +66,33 @@ def check_dir(d, create=False, clean=False):
         if not os.path.isdir(d):
             raise Fail("Not a directory: %s" % d)
         if clean:
-            for x in glob.glob(os.path.join(d, "*")):
-                rm_one(x)
+            dirs = []
+            with os.scandir(d) as it:
+                for entry in it:
+                    # glob('*') used to skip hidden entries, keep doing so
+                    if entry.name.startswith('.'):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        log.info("Removing dir: %s", entry.path)
+                        dirs.append(entry.path)
+                    else:
+                        log.info("Removing file: %s", entry.path)
+                        os.remove(entry.path)
+            rm_trees(dirs)
     else:
         if create:
             os.makedirs(d)
     return d
 
 def check_executable(cmd):
+    return check_executable_cached(tuple(cmd))
+
+# Probes are repeated (e.g. cmake and ninja from the same SDK folder), only run each command once
+@lru_cache(maxsize=None)
+def check_executable_cached(cmd):
     try:
-        log.debug("Executing: %s" % cmd)
-        result = subprocess.check_output(cmd, stderr=subprocess.STDOUT)
+        log.debug("Executing: %s", list(cmd))
+        result = subprocess.check_output(list(cmd), stderr=subprocess.STDOUT)
         if not isinstance(result, str):
             result = result.decode("utf-8")
         log.debug("Result: %s" % (result+'\n').split('\n')[0])
@@ -68,50 +101,111 @@ def check_executable(cmd):
         log.debug('Failed: %s' % e)
         return False
 
+VISP_VERSION_RE = re.compile(r'^set\(VISP_(VERSION_MAJOR|VERSION_MINOR|VERSION_PATCH|REVISION) \"(\d+)\"\)$', re.MULTILINE)
+
 def determine_visp_version(version_hpp_path):
     with open(version_hpp_path, "rt") as f:
         data = f.read()
-        major = re.search(r'^set\(VISP_VERSION_MAJOR \"(\d+)\"\)$', data, re.MULTILINE).group(1)
-        minor = re.search(r'^set\(VISP_VERSION_MINOR \"(\d+)\"\)$', data, re.MULTILINE).group(1)
-        patch = re.search(r'^set\(VISP_VERSION_PATCH \"(\d+)\"\)$', data, re.MULTILINE).group(1)
-        revision = re.search(r'^set\(VISP_REVISION \"(\d+)\"\)$', data, re.MULTILINE).group(1)
-        return "%(major)s.%(minor)s.%(patch)s-%(revision)s" % locals()
+    fields = {}
+    for m in VISP_VERSION_RE.finditer(data):
+        fields.setdefault(m.group(1), m.group(2))
+    try:
+        return "%(VERSION_MAJOR)s.%(VERSION_MINOR)s.%(VERSION_PATCH)s-%(REVISION)s" % fields
+    except KeyError as e:
+        raise Fail("Can't find VISP_%s in %s" % (e.args[0], version_hpp_path))
 
 # shutil.move fails if dst exists
 def move_smart(src, dst):
-    def move_recurse(subdir):
-        s = os.path.join(src, subdir)
-        d = os.path.join(dst, subdir)
-        if os.path.exists(d):
-            if os.path.isdir(d):
-                for item in os.listdir(s):
-                    move_recurse(os.path.join(subdir, item))
-            elif os.path.isfile(s):
-                shutil.move(s, d)
-        else:
+    def move_one(s, d):
+        try:
+            os.replace(s, d)
+        except OSError:
+            # e.g. EXDEV when src and dst are not on the same filesystem
             shutil.move(s, d)
-    move_recurse('')
-
-# shutil.copytree fails if dst exists
-def copytree_smart(src, dst):
-    def copy_recurse(subdir):
-        s = os.path.join(src, subdir)
-        d = os.path.join(dst, subdir)
-        if os.path.exists(d):
-            if os.path.isdir(d):
-                for item in os.listdir(s):
-                    copy_recurse(os.path.join(subdir, item))
-            elif os.path.isfile(s):
-                shutil.copy2(s, d)
-        else:
-            if os.path.isdir(s):
-                shutil.copytree(s, d)
-            elif os.path.isfile(s):
-                shutil.copy2(s, d)
-    copy_recurse('')
-
-def get_highest_version(subdirs):
-    return max(subdirs, key=lambda dir: [int(comp) for comp in os.path.split(dir)[-1].split('.')])
+    for root, dirs, files in os.walk(src):
+        d = os.path.join(dst, os.path.relpath(root, src))
+        os.makedirs(d, exist_ok=True)
+        # os.walk lists symlinks to directories in dirs without following them: move the links themselves
+        for name in [name for name in dirs if os.path.islink(os.path.join(root, name))]:
+            dirs.remove(name)
+            move_one(os.path.join(root, name), os.path.join(d, name))
+        for f in files:
+            move_one(os.path.join(root, f), os.path.join(d, f))
+
+# Content of a stamp file written by a previous run, None if there is none
+def read_stamp(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        return f.read()
+
+# Hard links are free on the same filesystem, fall back to a copy elsewhere
+def link_or_copy(src, dst):
+    if os.path.lexists(dst):
+        if os.path.exists(dst) and os.path.samefile(src, dst):
+            return
+        # dst may be a hard link shared with other files: replace it, never write into it
+        os.unlink(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+def copytree_smart(src, dst, copy_function=link_or_copy):
+    shutil.copytree(src, dst, dirs_exist_ok=True, copy_function=copy_function)
+
+def find_files(root, names):
+    # os.walk equivalent built on os.scandir, yielding paths of the files called one of names
+    dirs = [root]
+    while dirs:
+        try:
+            with os.scandir(dirs.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        dirs.append(entry.path)
+                    elif entry.name in names:
+                        yield entry.path
+        except OSError:
+            continue
+
+def get_android_api_level(platform_dir):
+    level = os.path.basename(platform_dir).split('-')[-1]
+    return int(level) if level.isdigit() else -1
+
+def get_javadoc_classpaths(sdk_dir):
+    # Look where the SDK installs the jars before falling back to scanning the whole SDK
+    # javadoc only needs one jar of each kind, so stop at the first match
+    classpaths = []
+    android_jars = glob.glob(os.path.join(sdk_dir, "platforms", "android-*", "android.jar"))
+    if len(android_jars) > 0:
+        classpaths.append(max(android_jars, key=lambda jar: get_android_api_level(os.path.dirname(jar))))
+    else:
+        classpaths.extend(itertools.islice(find_files(sdk_dir, ("android.jar",)), 1))
+    # annotations.jar is only shipped by older SDK tools
+    annotations_jars = itertools.chain(glob.iglob(os.path.join(sdk_dir, "tools", "support", "annotations.jar")),
+                                       glob.iglob(os.path.join(sdk_dir, "extras", "**", "annotations.jar"), recursive=True))
+    classpaths.extend(itertools.islice(annotations_jars, 1))
+    return classpaths
+
+def get_default_link_jobs():
+    # Linking the large ViSP libraries takes a few GB each: allow one link per 4 GB of memory
+    try:
+        mem_gb = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') // (1024 ** 3)
+    except (AttributeError, ValueError, OSError):
+        return None
+    return max(1, mem_gb // 4)
+
+def get_version_key(dir):
+    return [int(comp) for comp in os.path.split(dir)[-1].split('.')]
+
+# There could be more than one version installed (cmake, NDK side-by-side): list them once, most recent first
+@lru_cache(maxsize=None)
+def list_versioned_subdirs(root, probe_file):
+    if not os.path.isdir(root):
+        return []
+    with os.scandir(root) as it:
+        subdirs = [e.path for e in it if e.is_dir() and os.path.exists(os.path.join(e.path, probe_file))]
+    return sorted(subdirs, key=get_version_key, reverse=True)
 
 #===================================================================================================
 
@@ -154,12 +248,36 @@ class Builder:
         self.debug_info = True if config.debug_info else False
         self.abi_name = "undefined"
         self.additional_cmake_flags = config.additional_cmake_flags
+        self.jobs = config.jobs
+        self.link_jobs = config.link_jobs if config.link_jobs is not None else get_default_link_jobs()
+        self.build_env = None
+        if self.use_ccache:
+            self.build_env = os.environ.copy()
+            # Let cache hits survive a move of the work directory and timestamps embedded in sources
+            self.build_env.setdefault('CCACHE_BASEDIR', self.vispdir)
+            self.build_env.setdefault('CCACHE_SLOPPINESS', "time_macros,include_file_mtime,pch_defines")
+        if config.distcc:
+            # distcc is used as the ccache prefix so that only cache misses are sent to remote hosts
+            if self.build_env is None:
+                self.build_env = os.environ.copy()
+            if config.distcc_hosts is not None:
+                self.build_env['DISTCC_HOSTS'] = config.distcc_hosts
+            if self.use_ccache:
+                self.build_env['CCACHE_PREFIX'] = "distcc"
+            if self.jobs is None:
+                # Local cores are no longer the limit
+                self.jobs = 4 * os.cpu_count()
 
     def setABI(self, abi: ABI):
       self.abi_name = abi.name
-      self.libdest = check_dir(os.path.join(self.workdir, "o4a", abi.name), create=True, clean=True)
-      self.resultdest = check_dir(os.path.join(self.workdir, 'visp-android-sdk', abi.name), create=True, clean=True)
-      self.docdest = check_dir(os.path.join(self.workdir, 'visp-android-sdk', abi.name, 'sdk', 'java', 'javadoc'), create=True, clean=True)
+      # Builds start from an empty build directory, unless the previous one is reused on purpose
+      # (it is then cleaned selectively by clean_library_build_dir)
+      keep_build_dir = (self.config.incremental or self.config.keep_cmake_cache) and not self.config.reconfigure
+      self.libdest = check_dir(os.path.join(self.workdir, "o4a", abi.name), create=True, clean=not keep_build_dir)
+      # With --skip_if_fresh, the previous results are kept until we know whether the install can be skipped
+      clean_results = not self.config.skip_if_fresh
+      self.resultdest = check_dir(os.path.join(self.workdir, 'visp-android-sdk', abi.name), create=True, clean=clean_results)
+      self.docdest = check_dir(os.path.join(self.workdir, 'visp-android-sdk', abi.name, 'sdk', 'java', 'javadoc'), create=True, clean=clean_results)
 
     def get_cmake(self):
         if not self.config.use_android_buildtools and check_executable(['cmake', '--version']):
@@ -167,11 +285,10 @@ class Builder:
             return 'cmake'
         # look to see if Android SDK's cmake is installed
         android_cmake = os.path.join(os.environ['ANDROID_SDK'], 'cmake')
-        if os.path.exists(android_cmake):
-            cmake_subdirs = [f for f in os.listdir(android_cmake) if check_executable([os.path.join(android_cmake, f, 'bin', 'cmake'), '--version'])]
-            if len(cmake_subdirs) > 0:
-                # there could be more than one - get the most recent
-                cmake_from_sdk = os.path.join(android_cmake, get_highest_version(cmake_subdirs), 'bin', 'cmake')
+        # get the most recent, SDK binaries are not run to check them: os.access is enough
+        for cmake_subdir in list_versioned_subdirs(android_cmake, os.path.join('bin', 'cmake')):
+            cmake_from_sdk = os.path.join(cmake_subdir, 'bin', 'cmake')
+            if os.access(cmake_from_sdk, os.X_OK):
                 log.info("Using cmake from Android SDK: %s", cmake_from_sdk)
                 return cmake_from_sdk
         raise Fail("Can't find cmake")
@@ -182,11 +299,10 @@ class Builder:
             return 'ninja'
         # Android SDK's cmake includes a copy of ninja - look to see if its there
         android_cmake = os.path.join(os.environ['ANDROID_SDK'], 'cmake')
-        if os.path.exists(android_cmake):
-            cmake_subdirs = [f for f in os.listdir(android_cmake) if check_executable([os.path.join(android_cmake, f, 'bin', 'ninja'), '--version'])]
-            if len(cmake_subdirs) > 0:
-                # there could be more than one - just take the first one
-                ninja_from_sdk = os.path.join(android_cmake, cmake_subdirs[0], 'bin', 'ninja')
+        # take the most recent
+        for cmake_subdir in list_versioned_subdirs(android_cmake, os.path.join('bin', 'ninja')):
+            ninja_from_sdk = os.path.join(cmake_subdir, 'bin', 'ninja')
+            if os.access(ninja_from_sdk, os.X_OK):
                 log.info("Using ninja from Android SDK: %s", ninja_from_sdk)
                 return ninja_from_sdk
         raise Fail("Can't find ninja")
@@ -211,7 +327,16 @@ class Builder:
         self.extra_packs.append((ver, check_dir(path)))
 
     def clean_library_build_dir(self):
-        for d in ["CMakeCache.txt", "CMakeFiles/", "bin/", "libs/", "lib/", "package/", "install/samples/"]:
+        if self.config.incremental:
+            # Let ninja rebuild only what changed, the samples libraries are copied again by gather_results
+            dirs = ["install/samples/"]
+        elif self.config.keep_cmake_cache:
+            # Build everything again, but keep the configure results (compiler and feature checks) of the previous run
+            dirs = sorted(name for name in os.listdir(self.libdest) if name not in ("CMakeCache.txt", "CMakeFiles"))
+        else:
+            # setABI already emptied the build directory
+            return
+        for d in dirs:
             rm_one(d)
 
     def build_library(self, abi):
@@ -227,6 +352,7 @@ class Builder:
             INSTALL_ANDROID_EXAMPLES="ON",
             CMAKE_C_FLAGS="-fopenmp  -static-openmp",
             CMAKE_CXX_FLAGS="-fopenmp  -static-openmp",
+            CMAKE_EXPORT_COMPILE_COMMANDS="ON",
         )
         if self.additional_cmake_flags is not None:
             cmake_vars.update(self.additional_cmake_flags)
@@ -240,21 +366,73 @@ class Builder:
         if self.debug_info:  # Release with debug info
             cmake_vars['BUILD_WITH_DEBUG_INFO'] = "ON"
 
+        if self.config.unity_build:
+            if self.debug:
+                log.info("Unity build is disabled for 'Debug' binaries (it slows down incremental rebuilds)")
+            else:
+                cmake_vars['CMAKE_UNITY_BUILD'] = "ON"
+                cmake_vars['CMAKE_UNITY_BUILD_BATCH_SIZE'] = str(self.config.unity_batch_size)
+
+        if self.link_jobs is not None:
+            # Compilation jobs are limited by ninja -j, links by a dedicated pool so that they do not exhaust memory
+            cmake_vars['CMAKE_JOB_POOLS'] = "link=%d" % self.link_jobs
+            cmake_vars['CMAKE_JOB_POOL_LINK'] = "link"
+
         if self.config.extra_modules_path is not None:
             cmd.append("-DVISP_CONTRIB_MODULES_PATH='%s'" % self.config.extra_modules_path)
 
-        if self.use_ccache == True:
-            cmd.append("-DNDK_CCACHE=ccache")
+        launcher = "ccache" if self.use_ccache else ("distcc" if self.config.distcc else None)
+        if launcher is not None:
+            if cmake_vars['CMAKE_TOOLCHAIN_FILE'] == os.path.join(SCRIPT_DIR, "android.toolchain.cmake") and launcher == "ccache":
+                # Legacy toolchain shipped with ViSP, which wraps the compilers itself
+                cmd.append("-DNDK_CCACHE=ccache")
+            else:
+                # NDK toolchains ignore NDK_CCACHE
+                cmake_vars['CMAKE_C_COMPILER_LAUNCHER'] = launcher
+                cmake_vars['CMAKE_CXX_COMPILER_LAUNCHER'] = launcher
 
         cmake_vars['BUILD_JAVA'] = "ON"
 
         cmake_vars.update(abi.cmake_vars)
         cmd += [ "-D%s='%s'" % (k, v) for (k, v) in cmake_vars.items() if v is not None]
         cmd.append(self.vispdir)
-        execute(cmd)
-        # full parallelism for C++ compilation tasks
-        execute([self.ninja_path, "visp_modules"])
-        execute([self.ninja_path, "install" if (self.debug_info or self.debug) else "install/strip"])
+        # The generated build.ninja re-runs CMake by itself when CMake files change,
+        # so configuring again is only needed when the options differ from the previous run
+        cmake_cmd_path = os.path.join(self.libdest, "cmake_command.txt")
+        cmake_cmd_str = shlex.join(cmd)
+        if self.config.skip_if_fresh and os.path.exists(os.path.join(self.libdest, "build.ninja")) and \
+           read_stamp(cmake_cmd_path) == cmake_cmd_str:
+            log.info("Build directory already configured with the same options, skipping CMake")
+        else:
+            execute(cmd, env=self.build_env)
+            with open(cmake_cmd_path, "w") as f:
+                f.write(cmake_cmd_str)
+        ninja_cmd = [self.ninja_path]
+        if self.jobs is not None:
+            ninja_cmd += ["-j", str(self.jobs)]
+        install_target = "install" if (self.debug_info or self.debug) else "install/strip"
+        # Written after a successful install, removed before building so that a failed run is never taken as fresh
+        install_stamp_path = os.path.join(self.libdest, "install_stamp.txt")
+        if self.config.skip_if_fresh and read_stamp(install_stamp_path) == install_target \
+           and len(os.listdir(self.resultdest)) > 0 and not self.has_work(ninja_cmd, "visp_modules"):
+            # Installing again would copy and strip all the libraries for nothing
+            log.info("Nothing to rebuild since the last install, skipping %s", install_target)
+            return False
+        rm_one(install_stamp_path)
+        # full parallelism for C++ compilation tasks, a single ninja run schedules the install steps as soon as possible
+        execute(ninja_cmd + ["visp_modules", install_target], env=self.build_env)
+        with open(install_stamp_path, "w") as f:
+            f.write(install_target)
+        return True
+
+    def has_work(self, ninja_cmd, target):
+        # Dry run: ninja lists the commands it would run, without running them
+        try:
+            result = subprocess.run(ninja_cmd + ["-n", target], check=True, stdout=subprocess.PIPE,
+                                    universal_newlines=True, env=self.build_env)
+        except (subprocess.CalledProcessError, OSError):
+            return True
+        return "ninja: no work to do." not in result.stdout
 
     def build_javadoc(self):
       confFilePath = os.path.join(self.libdest, "root_android.txt")
@@ -268,14 +446,10 @@ class Builder:
         print("-> Read \"" + line + "\"")
         rootJavadoc = os.path.join(line, "visp", "build", "docs", "javadoc")
         print("\t->Copying content of \"" + str(rootJavadoc) + "\"")
-        copy_tree(rootJavadoc, self.docdest)
+        copytree_smart(rootJavadoc, self.docdest)
       else:
         print("\tIt DOES NOT exist =(")
-        classpaths = []
-        for dir, _, files in os.walk(os.environ["ANDROID_SDK"]):
-            for f in files:
-                if f == "android.jar" or f == "annotations.jar":
-                    classpaths.append(os.path.join(dir, f))
+        classpaths = get_javadoc_classpaths(os.environ["ANDROID_SDK"])
         srcdir = os.path.join(self.resultdest, 'sdk', 'java', 'src')
         dstdir = self.docdest
         cmd = [
@@ -288,7 +462,8 @@ class Builder:
             "-classpath", ":".join(classpaths),
             '-subpackages', 'org.visp',
         ]
-        execute(cmd)
+        # javadoc prints a line per generated page on stdout, its warnings and errors go to stderr
+        execute(cmd, quiet=not log.getLogger().isEnabledFor(log.DEBUG))
 
     def copyLibsInSamplesDir(self):
         root = os.path.join(self.libdest, "install", "sdk", "native")
@@ -300,45 +475,84 @@ class Builder:
           for item in os.listdir(source_folder):
             src = os.path.join(source_folder, item)
             dst = os.path.join(dest, item)
-            shutil.copy2(src, dst)
+            link_or_copy(src, dst)
 
     def gather_results(self):
+        if self.config.skip_if_fresh:
+            # Not cleaned by setABI, as the install could have been skipped
+            check_dir(self.resultdest, clean=True)
+            check_dir(self.docdest, create=True)
         # Copy compiled libaries in the sample directory
         self.copyLibsInSamplesDir()
         # Copy all files
         root = os.path.join(self.libdest, "install")
-        for item in os.listdir(root):
-            src = os.path.join(root, item)
-            dst = os.path.join(self.resultdest, item)
-            if os.path.isdir(src):
-                log.info("Copy dir: %s", item)
+        # Entries are moved out of root, list them before
+        with os.scandir(root) as it:
+            entries = list(it)
+        dir_count, file_count = 0, 0
+        for entry in entries:
+            src = entry.path
+            dst = os.path.join(self.resultdest, entry.name)
+            if entry.is_dir():
+                dir_count += 1
                 if self.config.force_copy:
-                    copytree_smart(src, dst)
+                    # Real copies: the install tree and the result must not share inodes
+                    copytree_smart(src, dst, copy_function=shutil.copy2)
+                elif not os.path.exists(dst):
+                    # Single rename of the whole tree on the same filesystem
+                    shutil.move(src, dst)
                 else:
                     move_smart(src, dst)
-            elif os.path.isfile(src):
-                log.info("Copy file: %s", item)
+            elif entry.is_file():
+                file_count += 1
                 if self.config.force_copy:
                     shutil.copy2(src, dst)
                 else:
                     shutil.move(src, dst)
+        log.info("%s %d dirs and %d files to %s", "Copied" if self.config.force_copy else "Moved", dir_count, file_count, self.resultdest)
 
 def get_ndk_dir():
     # look to see if Android NDK is installed
     android_sdk_ndk = os.path.join(os.environ["ANDROID_SDK"], 'ndk')
     android_sdk_ndk_bundle = os.path.join(os.environ["ANDROID_SDK"], 'ndk-bundle')
-    if os.path.exists(android_sdk_ndk):
-        ndk_subdirs = [f for f in os.listdir(android_sdk_ndk) if os.path.exists(os.path.join(android_sdk_ndk, f, 'package.xml'))]
-        if len(ndk_subdirs) > 0:
-            # there could be more than one - get the most recent
-            ndk_from_sdk = os.path.join(android_sdk_ndk, get_highest_version(ndk_subdirs))
-            log.info("Using NDK (side-by-side) from Android SDK: %s", ndk_from_sdk)
-            return ndk_from_sdk
+    ndk_subdirs = list_versioned_subdirs(android_sdk_ndk, 'package.xml')
+    if len(ndk_subdirs) > 0:
+        # get the most recent
+        ndk_from_sdk = ndk_subdirs[0]
+        log.info("Using NDK (side-by-side) from Android SDK: %s", ndk_from_sdk)
+        return ndk_from_sdk
     if os.path.exists(os.path.join(android_sdk_ndk_bundle, 'package.xml')):
         log.info("Using NDK bundle from Android SDK: %s", android_sdk_ndk_bundle)
         return android_sdk_ndk_bundle
     return None
 
+def build_abi(builder, abi):
+    log.info("=====")
+    log.info("===== Building library for %s", abi)
+    log.info("=====")
+    builder.setABI(abi)
+    os.chdir(builder.libdest)
+    builder.clean_library_build_dir()
+    if builder.build_library(abi):
+        builder.gather_results()
+    if builder.config.build_doc:
+        builder.build_javadoc()
+    # The builder is reused for the next ABI, only its locations for this one are kept
+    return builder.resultdest, builder.docdest
+
+def init_abi_worker(log_format, log_level):
+    # Same logging configuration as the parent process
+    log.basicConfig(format=log_format, level=log_level)
+
+def build_abi_in_worker(config, abi, abi_count):
+    # Each worker process has its own builder (the builder keeps per-ABI state) and working directory
+    builder = Builder(config.work_dir, config.visp_dir, config)
+    # Share the build jobs between the ABIs built concurrently
+    builder.jobs = max(1, (builder.jobs or os.cpu_count()) // abi_count)
+    if builder.link_jobs is not None:
+        builder.link_jobs = max(1, builder.link_jobs // abi_count)
+    return build_abi(builder, abi)
+
 #===================================================================================================
 
 if __name__ == "__main__":
@@ -354,14 +568,26 @@ if __name__ == "__main__":
     parser.add_argument('--sign_with', help="Certificate to sign the Manager apk")
     parser.add_argument('--build_doc', action="store_true", help="Build javadoc")
     parser.add_argument('--no_ccache', action="store_true", help="Do not use ccache during library build")
+    parser.add_argument('--distcc', action="store_true", help="Distribute compilation with distcc (through ccache when it is used)")
+    parser.add_argument('--distcc_hosts', help="Hosts to distribute compilation to (DISTCC_HOSTS), defaults to the distcc configuration")
+    parser.add_argument('--parallel_abis', action="store_true", help="Build all ABIs concurrently, sharing the build jobs between them (needs more memory)")
+    parser.add_argument('--jobs', type=int, help="Number of parallel build jobs, defaults to ninja's choice (4x the number of cores with --distcc)")
+    parser.add_argument('--link_jobs', type=int, help="Number of parallel link jobs, defaults to one per 4 GB of memory")
     parser.add_argument('--force_copy', action="store_true", help="Do not use file move during library build (useful for debug)")
+    parser.add_argument('--incremental', action="store_true", help="Keep the build directory of the previous run so that only what changed is rebuilt (for development, by default each build starts from an empty build directory)")
+    parser.add_argument('--keep_cmake_cache', action="store_true", help="Build everything again but keep the CMake cache of the previous run, so that the compiler and feature checks are not run again")
+    parser.add_argument('--skip_if_fresh', action="store_true", help="Do not run CMake again when the build dir was configured with the same options, nor install when there is nothing to rebuild (implies --incremental)")
+    parser.add_argument('--reconfigure', action="store_true", help="With --incremental or --keep_cmake_cache, start from an empty build directory anyway (needed when changing the NDK or toolchain)")
     parser.add_argument('--force_visp_toolchain', action="store_true", help="Do not use toolchain from Android NDK")
     parser.add_argument('--debug', action="store_true", help="Build 'Debug' binaries (CMAKE_BUILD_TYPE=Debug)")
     parser.add_argument('--debug_info', action="store_true", help="Build with debug information (useful for Release mode: BUILD_WITH_DEBUG_INFO=ON)")
+    parser.add_argument('--unity_build', action="store_true", help="Compile batches of source files as single translation units (CMAKE_UNITY_BUILD=ON), ignored for 'Debug' builds")
+    parser.add_argument('--unity_batch_size', type=int, default=16, help="Number of source files per translation unit with --unity_build")
     parser.add_argument('--additional_cmake_flags', nargs='?', type=lambda x: {k:v for k,v in (i.split('=') for i in x.split(','))}, help="Additional CMake flags to use, in comma-separated field=position pairs such as 'OPENCV_DIR=something,PCL_DIR=something'")
     args = parser.parse_args()
 
-    log.basicConfig(format='%(message)s', level=log.DEBUG)
+    log_format, log_level = '%(message)s', log.DEBUG
+    log.basicConfig(format=log_format, level=log_level)
     log.debug("Args: %s", args)
 
     if args.ndk_path is not None:
@@ -388,6 +614,13 @@ if __name__ == "__main__":
         log.info("ccache not found - disabling ccache support")
         args.no_ccache = True
 
+    if args.skip_if_fresh and not args.incremental:
+        log.info("--skip_if_fresh needs the previous build directory - enabling --incremental")
+        args.incremental = True
+
+    if args.distcc and not check_executable(['distcc', '--version']):
+        raise Fail("distcc not found, it is required by --distcc")
+
     if os.path.realpath(args.work_dir) == os.path.realpath(SCRIPT_DIR):
         raise Fail("Specify workdir (building from script directory is not supported)")
     if os.path.realpath(args.work_dir) == os.path.realpath(args.visp_dir):
@@ -411,8 +644,12 @@ if __name__ == "__main__":
     print(cfg.strip())
     print('=' * 80)
 
-    ABIs = None  # make flake8 happy
-    exec(compile(cfg, cpath, 'exec'))
+    # Load the configuration as a module so that its bytecode is cached, configurations use ABI without importing it
+    spec = importlib.util.spec_from_file_location("abi_config", cpath)
+    abi_config = importlib.util.module_from_spec(spec)
+    abi_config.ABI = ABI
+    spec.loader.exec_module(abi_config)
+    ABIs = abi_config.ABIs
 
     log.info("Android NDK path: %s", os.environ["ANDROID_NDK"])
     log.info("Android SDK path: %s", os.environ["ANDROID_SDK"])
@@ -421,20 +658,16 @@ if __name__ == "__main__":
 
     log.info("Detected ViSP version: %s", builder.visp_version)
 
-    for i, abi in enumerate(ABIs):
-        log.info("=====")
-        log.info("===== Building library for %s", abi)
-        log.info("=====")
-        builder.setABI(abi)
-        os.chdir(builder.libdest)
-        builder.clean_library_build_dir()
-        builder.build_library(abi)
-        builder.gather_results()
-        if args.build_doc:
-            builder.build_javadoc()
+    if args.parallel_abis and len(ABIs) > 1:
+        with ProcessPoolExecutor(max_workers=len(ABIs), initializer=init_abi_worker, initargs=(log_format, log_level)) as executor:
+            futures = [executor.submit(build_abi_in_worker, args, abi, len(ABIs)) for abi in ABIs]
+            locations = [future.result() for future in futures]
+    else:
+        locations = [build_abi(builder, abi) for abi in ABIs]
 
     log.info("=====")
     log.info("===== Build finished")
     log.info("=====")
-    log.info("SDK location: %s", builder.resultdest)
-    log.info("Documentation location: %s", builder.docdest)
+    for abi, (resultdest, docdest) in zip(ABIs, locations):
+        log.info("SDK location for %s: %s", abi.name, resultdest)
+        log.info("Documentation location for %s: %s", abi.name, docdest)